@@ -1,252 +1,247 @@
+import functools
+import logging
+import secrets
 import time
-import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Optional, List
+from typing import Callable, Optional, List
 from pathlib import Path
-import os
 
 from config import Config
-from models import ProcessingResult, ProcessingStatus
+from models import ProcessingResult, ProcessingStatus, format_timestamp
 from audio_processor import AudioProcessor
 from llm_processor import LLMProcessor
 from calendar_manager import CalendarManager
 
+logger = logging.getLogger(__name__)
+
+def _new_meeting_id() -> str:
+    """Generate a random 128-bit meeting ID as 32 hex characters"""
+    return secrets.token_hex(16)
+
+# Optional analysis stages run after transcription by the *_only pipelines
+_STAGE_MINUTES = 1
+_STAGE_EVENTS = 2
+
+def _timed_pipeline(description: str):
+    """
+    Wrap a pipeline stage body with result creation, timing and error handling
+    
+    The decorated method receives (audio_path, result) and fills in the result;
+    callers keep the public (audio_path, meeting_id=None) -> ProcessingResult signature.
+    
+    Args:
+        description: Human-readable pipeline name used in progress messages
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, audio_path: str, meeting_id: Optional[str] = None) -> ProcessingResult:
+            start_time = time.perf_counter()
+            result = ProcessingResult(
+                status=ProcessingStatus.PROCESSING,
+                meeting_id=meeting_id or _new_meeting_id()
+            )
+            
+            try:
+                logger.info("%s started for meeting: %s", description, result.meeting_id)
+                fn(self, audio_path, result)
+                result.status = ProcessingStatus.COMPLETED
+            except Exception as e:
+                result.status = ProcessingStatus.FAILED
+                result.error_message = str(e)
+                logger.error("%s failed: %s", description, e)
+            finally:
+                result.processing_time = time.perf_counter() - start_time
+            
+            if result.status == ProcessingStatus.COMPLETED:
+                logger.info("%s completed successfully in %.2f seconds", description, result.processing_time)
+            return result
+        return wrapper
+    return decorator
+
 class AIAgent:
     """Main AI Agent that orchestrates meeting processing and calendar management"""
     
     def __init__(self):
         """Initialize the AI Agent with all components"""
-        print("Initializing AI Agent...")
+        logger.info("Initializing AI Agent...")
+        
+        # Create output directories once per process; saves assume they exist
+        Config.ensure_directories()
         
         # Validate configuration
         if not Config.validate_config():
-            print("Warning: Some configuration is missing. Some features may not work.")
+            logger.warning("Warning: Some configuration is missing. Some features may not work.")
         
         # Initialize components
         self.audio_processor = AudioProcessor()
         self.llm_processor = LLMProcessor()
         self.calendar_manager = CalendarManager()
         
-        print("AI Agent initialized successfully")
+        # Background pool for output files so DOCX generation stays off the critical path
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ai-agent-io")
+        
+        logger.info("AI Agent initialized successfully")
+    
+    def close(self):
+        """Wait for pending background file writes and release worker threads and connections"""
+        self._io_pool.shutdown(wait=True)
+        self.llm_processor.close()
     
-    def process_meeting(self, audio_path: str, meeting_id: Optional[str] = None) -> ProcessingResult:
+    @_timed_pipeline("Meeting processing")
+    def process_meeting(self, audio_path: str, result: ProcessingResult):
         """
         Complete meeting processing pipeline
         
         Args:
             audio_path: Path to the audio file
-            meeting_id: Optional meeting ID (generated if not provided)
-            
-        Returns:
-            ProcessingResult with all outputs
+            result: ProcessingResult to fill in with the transcript, minutes and calendar events
         """
-        start_time = time.time()
-        
-        if not meeting_id:
-            meeting_id = str(uuid.uuid4())
-        
-        result = ProcessingResult(
-            status=ProcessingStatus.PROCESSING,
-            meeting_id=meeting_id
-        )
-        
+        # Step 1: Process audio and generate transcript
+        logger.info("Step 1: Processing audio and generating transcript...")
+        transcript = self.audio_processor.process_audio_file(audio_path, result.meeting_id)
+        result.transcript = transcript
+        
+        # Step 2: Infer speaker names, generate minutes and extract calendar events
+        # in a single LLM call; fall back to the individual calls if the combined
+        # response cannot be used
+        logger.info("Step 2: Analyzing transcript (speaker names, minutes, calendar events)...")
         try:
-            print(f"Starting meeting processing for: {meeting_id}")
-            
-            # Step 1: Process audio and generate transcript
-            print("Step 1: Processing audio and generating transcript...")
-            transcript = self.audio_processor.process_audio_file(audio_path, meeting_id)
-            result.transcript = transcript
-            
-            # Step 1.5: Infer speaker names and relabel transcript
-            print("Step 1.5: Inferring speaker names and relabeling transcript...")
-            speaker_map = self.llm_processor.infer_speaker_names(transcript)
-            if speaker_map:
-                try:
-                    # Relabel segments
-                    for segment in transcript.segments:
-                        if segment.speaker in speaker_map:
-                            segment.speaker = speaker_map[segment.speaker]
-                    # Relabel participants
-                    for speaker in transcript.speakers:
-                        if speaker.speaker_id in speaker_map:
-                            speaker.speaker_id = speaker_map[speaker.speaker_id]
-                    print(f"✅ Applied speaker names: {speaker_map}")
-                except Exception as e:
-                    import traceback; traceback.print_exc()
-                    raise
-            else:
-                print("ℹ️  No speaker names could be inferred, keeping original labels")
-
-            # Step 2: Generate meeting minutes using LLM (with speaker names)
-            print("Step 2: Generating meeting minutes...")
-            minutes = self.llm_processor.generate_meeting_minutes(transcript)
-            result.minutes = minutes
-            
-            # Step 3: Extract calendar events (with speaker names)
-            print("Step 3: Extracting calendar events...")
-            calendar_events = self.llm_processor.extract_calendar_events(transcript, minutes)
-            result.calendar_events = calendar_events
-            
-            # Step 4: Create calendar events
-            if calendar_events:
-                print("Step 4: Creating calendar events...")
-                created_events = self.calendar_manager.create_events(calendar_events)
-                print(f"Created {len(created_events)} calendar events")
-            
-            # Update result
-            result.status = ProcessingStatus.COMPLETED
-            result.processing_time = time.time() - start_time
-            
-            print(f"Meeting processing completed successfully in {result.processing_time:.2f} seconds")
-            
+            speaker_map, minutes, calendar_events = self.llm_processor.process_transcript_batch(transcript)
+            self._apply_speaker_map(transcript, speaker_map)
         except Exception as e:
-            result.status = ProcessingStatus.FAILED
-            result.error_message = str(e)
-            result.processing_time = time.time() - start_time
-            
-            print(f"Meeting processing failed: {str(e)}")
-        
-        return result
+            logger.warning("Combined analysis failed (%s), falling back to individual LLM calls", e)
+            minutes, calendar_events = self._analyze_transcript_staged(transcript)
+        result.minutes = minutes
+        result.calendar_events = calendar_events
+        
+        # Step 3: Create calendar events
+        if calendar_events:
+            logger.info("Step 3: Creating calendar events...")
+            self._create_events(calendar_events)
     
-    def generate_minutes_only(self, audio_path: str, meeting_id: Optional[str] = None) -> ProcessingResult:
+    def process_meetings_batch(self, audio_paths: List[str], max_concurrency: int = 4,
+                               on_result: Optional[Callable[[ProcessingResult], None]] = None) -> List[ProcessingResult]:
         """
-        Generate only meeting minutes without calendar events
+        Process several meetings concurrently with the full pipeline
         
         Args:
-            audio_path: Path to the audio file
-            meeting_id: Optional meeting ID
+            audio_paths: Paths to the audio files
+            max_concurrency: Maximum number of meetings processed at the same time
+            on_result: Optional callback run on the calling thread as each meeting finishes,
+                e.g. to start saving its outputs while the rest are still processing
             
         Returns:
-            ProcessingResult with transcript and minutes
+            List of ProcessingResult objects in the same order as audio_paths
         """
-        start_time = time.time()
-        
-        if not meeting_id:
-            meeting_id = str(uuid.uuid4())
-        
-        result = ProcessingResult(
-            status=ProcessingStatus.PROCESSING,
-            meeting_id=meeting_id
-        )
+        logger.info("Processing %s meetings with up to %s workers", len(audio_paths), max_concurrency)
+        
+        # Transcription and LLM calls are network-bound, so threads overlap them well
+        results: List[Optional[ProcessingResult]] = [None] * len(audio_paths)
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+            futures = {pool.submit(self.process_meeting, path): i for i, path in enumerate(audio_paths)}
+            for future in as_completed(futures):
+                result = results[futures[future]] = future.result()
+                if on_result is not None:
+                    on_result(result)
+        return results
+    
+    def _apply_speaker_map(self, transcript, speaker_map: dict):
+        """
+        Relabel transcript segments and participants with inferred speaker names
         
-        try:
-            print(f"Generating minutes for meeting: {meeting_id}")
-            
-            # Process audio and generate transcript
-            transcript = self.audio_processor.process_audio_file(audio_path, meeting_id)
-            result.transcript = transcript
-            
-            # Generate meeting minutes
-            minutes = self.llm_processor.generate_meeting_minutes(transcript)
-            result.minutes = minutes
-            
-            result.status = ProcessingStatus.COMPLETED
-            result.processing_time = time.time() - start_time
-            
-            print(f"Minutes generation completed successfully")
-            
-        except Exception as e:
-            result.status = ProcessingStatus.FAILED
-            result.error_message = str(e)
-            result.processing_time = time.time() - start_time
-            
-            print(f"Minutes generation failed: {str(e)}")
+        Args:
+            transcript: MeetingTranscript object (modified in place)
+            speaker_map: Dictionary mapping speaker labels to inferred names
+        """
+        if not speaker_map:
+            logger.info("ℹ️  No speaker names could be inferred, keeping original labels")
+            return
         
-        return result
+        transcript.relabel_speakers(speaker_map)
+        logger.info("✅ Applied speaker names: %s", speaker_map)
     
-    def extract_events_only(self, audio_path: str, meeting_id: Optional[str] = None) -> ProcessingResult:
+    def _analyze_transcript_staged(self, transcript):
         """
-        Extract only calendar events without generating minutes
+        Run speaker inference, minutes generation and event extraction as separate LLM calls
         
         Args:
-            audio_path: Path to the audio file
-            meeting_id: Optional meeting ID
+            transcript: MeetingTranscript object (relabeled in place)
             
         Returns:
-            ProcessingResult with transcript and calendar events
+            Tuple of (MeetingMinutes, list of CalendarEvent)
         """
-        start_time = time.time()
-        
-        if not meeting_id:
-            meeting_id = str(uuid.uuid4())
+        # Infer speaker names and relabel transcript
+        logger.info("Inferring speaker names and relabeling transcript...")
+        speaker_map = self.llm_processor.infer_speaker_names(transcript)
+        self._apply_speaker_map(transcript, speaker_map)
+        
+        # Both prompts start with the same relabeled transcript, so issuing the
+        # calls back-to-back lets the second reuse the server's cached prefix.
+        minutes = self.llm_processor.generate_meeting_minutes(transcript)
+        calendar_events = self.llm_processor.extract_calendar_events(transcript, minutes)
+        return minutes, calendar_events
+    
+    def _run_stages(self, audio_path: str, result: ProcessingResult, stages: int):
+        """
+        Transcribe an audio file and run the selected analysis stages
         
-        result = ProcessingResult(
-            status=ProcessingStatus.PROCESSING,
-            meeting_id=meeting_id
-        )
+        Args:
+            audio_path: Path to the audio file
+            result: ProcessingResult to fill in
+            stages: Bitmask of _STAGE_* flags to run after transcription
+        """
+        # Process audio and generate transcript
+        transcript = self.audio_processor.process_audio_file(audio_path, result.meeting_id)
+        result.transcript = transcript
+        
+        # Generate meeting minutes
+        if stages & _STAGE_MINUTES:
+            result.minutes = self.llm_processor.generate_meeting_minutes(transcript)
+        
+        # Extract and create calendar events
+        if stages & _STAGE_EVENTS:
+            result.calendar_events = self.llm_processor.extract_calendar_events(transcript, None)
+            if result.calendar_events:
+                self._create_events(result.calendar_events)
+    
+    def _create_events(self, calendar_events):
+        """Create calendar events (safe to call from concurrent meeting workers)"""
+        created_events = self.calendar_manager.create_events(calendar_events)
+        logger.info("Created %s calendar events", len(created_events))
+    
+    @_timed_pipeline("Minutes generation")
+    def generate_minutes_only(self, audio_path: str, result: ProcessingResult):
+        """
+        Generate only meeting minutes without calendar events
         
-        try:
-            print(f"Extracting events for meeting: {meeting_id}")
-            
-            # Process audio and generate transcript
-            transcript = self.audio_processor.process_audio_file(audio_path, meeting_id)
-            result.transcript = transcript
-            
-            # Extract calendar events
-            calendar_events = self.llm_processor.extract_calendar_events(transcript, None)
-            result.calendar_events = calendar_events
-            
-            # Create calendar events
-            if calendar_events:
-                created_events = self.calendar_manager.create_events(calendar_events)
-                print(f"Created {len(created_events)} calendar events")
-            
-            result.status = ProcessingStatus.COMPLETED
-            result.processing_time = time.time() - start_time
-            
-            print(f"Event extraction completed successfully")
-            
-        except Exception as e:
-            result.status = ProcessingStatus.FAILED
-            result.error_message = str(e)
-            result.processing_time = time.time() - start_time
-            
-            print(f"Event extraction failed: {str(e)}")
+        Args:
+            audio_path: Path to the audio file
+            result: ProcessingResult to fill in with the transcript and minutes
+        """
+        self._run_stages(audio_path, result, _STAGE_MINUTES)
+    
+    @_timed_pipeline("Event extraction")
+    def extract_events_only(self, audio_path: str, result: ProcessingResult):
+        """
+        Extract only calendar events without generating minutes
         
-        return result
+        Args:
+            audio_path: Path to the audio file
+            result: ProcessingResult to fill in with the transcript and calendar events
+        """
+        self._run_stages(audio_path, result, _STAGE_EVENTS)
     
-    def generate_transcript_only(self, audio_path: str, meeting_id: Optional[str] = None) -> ProcessingResult:
+    @_timed_pipeline("Transcript generation")
+    def generate_transcript_only(self, audio_path: str, result: ProcessingResult):
         """
         Generate only transcript without minutes or calendar events
         
         Args:
             audio_path: Path to the audio file
-            meeting_id: Optional meeting ID
-            
-        Returns:
-            ProcessingResult with transcript only
+            result: ProcessingResult to fill in with the transcript
         """
-        start_time = time.time()
-        
-        if not meeting_id:
-            meeting_id = str(uuid.uuid4())
-        
-        result = ProcessingResult(
-            status=ProcessingStatus.PROCESSING,
-            meeting_id=meeting_id
-        )
-        
-        try:
-            print(f"Generating transcript for meeting: {meeting_id}")
-            
-            # Process audio and generate transcript
-            transcript = self.audio_processor.process_audio_file(audio_path, meeting_id)
-            result.transcript = transcript
-            
-            result.status = ProcessingStatus.COMPLETED
-            result.processing_time = time.time() - start_time
-            
-            print(f"Transcript generation completed successfully")
-            
-        except Exception as e:
-            result.status = ProcessingStatus.FAILED
-            result.error_message = str(e)
-            result.processing_time = time.time() - start_time
-            
-            print(f"Transcript generation failed: {str(e)}")
-        
-        return result
+        self._run_stages(audio_path, result, 0)
     
     def analyze_transcript_file(self, transcript_file: str) -> dict:
         """
@@ -259,7 +254,7 @@ class AIAgent:
             Dictionary mapping speaker labels to inferred names
         """
         try:
-            print(f"Analyzing transcript file: {transcript_file}")
+            logger.info("Analyzing transcript file: %s", transcript_file)
             
             # Analyze the transcript file
             speaker_map = self.analyze_speaker_names_from_file(transcript_file)
@@ -267,7 +262,7 @@ class AIAgent:
             return speaker_map
             
         except Exception as e:
-            print(f"Error analyzing transcript file: {str(e)}")
+            logger.error("Error analyzing transcript file: %s", e)
             raise
     
     def save_transcript_to_file(self, transcript, output_path: str = ""):
@@ -281,46 +276,76 @@ class AIAgent:
         try:
             # Use default transcripts directory if no path specified
             if not output_path:
-                output_path = os.path.join(Config.TRANSCRIPTS_DIR, f"{transcript.meeting_id}_transcript.txt")
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                # Write header
-                f.write(f"Meeting Transcript - {transcript.meeting_id}\n")
-                f.write(f"Date: {transcript.created_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Duration: {transcript.duration//1000//60:02d}:{transcript.duration//1000%60:02d}\n")
-                f.write(f"Participants: {', '.join([f'{s.speaker_id}' for s in transcript.speakers])}\n")
-                f.write("=" * 80 + "\n\n")
-                
-                # Write transcript segments
-                for segment in transcript.segments:
-                    timestamp = f"[{segment.start//1000//60:02d}:{segment.start//1000%60:02d}]"
-                    f.write(f"{timestamp} {segment.speaker}: {segment.text}\n")
+                output_path = Config.TRANSCRIPTS_DIR / f"{transcript.meeting_id}_transcript.txt"
+            
+            # Header
+            lines = [
+                f"Meeting Transcript - {transcript.meeting_id}\n",
+                f"Date: {transcript.created_at.strftime('%Y-%m-%d %H:%M:%S')}\n",
+                f"Duration: {format_timestamp(transcript.duration)}\n",
+                f"Participants: {', '.join([f'{s.speaker_id}' for s in transcript.speakers])}\n",
+                "=" * 80 + "\n\n",
+            ]
+            
+            # Transcript segments
+            for segment in transcript.segments:
+                lines.append(f"[{format_timestamp(segment.start)}] {segment.speaker}: {segment.text}\n")
+            
+            # Single buffered write instead of one write per segment
+            with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.write("".join(lines))
                 
-            print(f"✅ Transcript saved to: {output_path}")
+            logger.info("✅ Transcript saved to: %s", output_path)
             
         except Exception as e:
-            print(f"❌ Error saving transcript: {str(e)}")
+            logger.error("❌ Error saving transcript: %s", e)
             raise
 
-    def save_minutes_to_file(self, minutes, output_path: str = ""):
+    def save_transcript_in_background(self, transcript, output_path: str = "") -> Future:
+        """
+        Save transcript to a text file on a background thread
+        
+        Call result() on the returned future to wait for it and re-raise write errors
+        (close() on the agent also waits, but errors are only logged).
+        
+        Args:
+            transcript: MeetingTranscript object
+            output_path: Optional custom path (if empty, uses default transcripts directory)
+            
+        Returns:
+            Future that completes when the file has been written
+        """
+        # save_transcript_to_file logs its own errors
+        return self._io_pool.submit(self.save_transcript_to_file, transcript, output_path)
+    
+    def save_minutes_to_file(self, minutes, output_path: str = "") -> Future:
         """
         Save meeting minutes to a DOCX file in the minutes directory
         
+        The file is written on a background thread; call result() on the returned
+        future to wait for it and re-raise write errors (close() on the agent also
+        waits, but errors are only logged).
+        
         Args:
             minutes: MeetingMinutes object
             output_path: Optional custom path (if empty, uses default minutes directory)
-        """
-        try:
-            # Use default minutes directory if no path specified
-            if not output_path:
-                output_path = os.path.join(Config.MINUTES_DIR, f"{minutes.meeting_id}_minutes.docx")
-            
-            # Always save as DOCX
-            self.save_minutes_to_docx(minutes, output_path)
             
-        except Exception as e:
-            print(f"❌ Error saving meeting minutes: {str(e)}")
-            raise
+        Returns:
+            Future that completes when the file has been written
+        """
+        # Use default minutes directory if no path specified
+        if not output_path:
+            output_path = Config.MINUTES_DIR / f"{minutes.meeting_id}_minutes.docx"
+        
+        # Always save as DOCX
+        future = self._io_pool.submit(self.save_minutes_to_docx, minutes, output_path)
+        
+        def _report_error(done: Future):
+            if done.exception() is not None:
+                logger.error("❌ Error saving meeting minutes: %s", done.exception())
+        
+        future.add_done_callback(_report_error)
+        return future
     
     def save_minutes_to_docx(self, minutes, output_path: str):
         """
@@ -389,7 +414,7 @@ class AIAgent:
         doc.add_paragraph(minutes.summary or "None.")
 
         doc.save(output_path)
-        print(f"Meeting minutes saved to: {output_path}")
+        logger.info("Meeting minutes saved to: %s", output_path)
     
     def get_processing_summary(self, result: ProcessingResult) -> str:
         """
@@ -413,9 +438,10 @@ Processing Time: {result.processing_time:.2f} seconds
             summary += f"Error: {result.error_message}\n"
         
         if result.transcript:
+            duration_minutes = result.transcript.duration / 60000
             summary += f"""
 Transcript:
-- Duration: {result.transcript.duration / 1000 / 60:.1f} minutes
+- Duration: {duration_minutes:.1f} minutes
 - Speakers: {len(result.transcript.speakers)}
 - Segments: {len(result.transcript.segments)}
 """
@@ -448,22 +474,21 @@ Calendar Events:
             Dictionary mapping speaker labels to inferred names
         """
         try:
-            # Read the transcript file
-            with open(transcript_file, 'r', encoding='utf-8') as f:
-                transcript_content = f.read()
+            # Read the transcript file (a missing file raises FileNotFoundError)
+            transcript_content = Path(transcript_file).read_text(encoding='utf-8')
             
-            print(f"📖 Analyzing transcript file: {transcript_file}")
+            logger.info("📖 Analyzing transcript file: %s", transcript_file)
             
             # Use LLM to analyze the transcript and infer speaker names
             speaker_map = self.llm_processor.analyze_speaker_names_from_text(transcript_content)
             
-            print("🔍 Speaker name analysis completed")
-            print("📊 Inferred speaker mapping:")
+            logger.info("🔍 Speaker name analysis completed")
+            logger.info("📊 Inferred speaker mapping:")
             for speaker_label, inferred_name in speaker_map.items():
-                print(f"   {speaker_label} → {inferred_name}")
+                logger.info("   %s → %s", speaker_label, inferred_name)
             
             return speaker_map
             
         except Exception as e:
-            print(f"❌ Error analyzing transcript file: {str(e)}")
+            logger.error("❌ Error analyzing transcript file: %s", e)
             raise 
@@ -1,13 +1,18 @@
-import assemblyai as aai
-import requests
-import time
-import json
-from typing import Optional, Dict, Any
+import logging
+import os
+import shutil
+import string
+import subprocess
+import tempfile
+from concurrent.futures import Future
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 
 from config import Config
 from models import MeetingTranscript, TranscriptionSegment, Speaker, SpeakerRole
 
+logger = logging.getLogger(__name__)
+
 class AudioProcessor:
     """Handles audio transcription and speaker diarization using AssemblyAI"""
     
@@ -16,6 +21,10 @@ class AudioProcessor:
         if not Config.ASSEMBLYAI_API_KEY:
             raise ValueError("AssemblyAI API key is required")
         
+        # assemblyai is imported where it is used rather than at module level,
+        # so CLI paths that never transcribe (e.g. --help) skip its import cost
+        import assemblyai as aai
+        
         self.config = aai.TranscriptionConfig(
             speaker_labels=True,
             speakers_expected=2,  # Default to 2 speakers, can be adjusted
@@ -39,57 +48,107 @@ class AudioProcessor:
         Returns:
             MeetingTranscript object with transcription and speaker information
         """
-        try:
-            print(f"Starting transcription for meeting: {meeting_id}")
-            
-            # Create transcription request (pass local file path directly)
-            transcript = aai.Transcriber().transcribe(
-                audio_path,
-                config=self.config
-            )
+        return self.transcribe_audio_async(audio_path, meeting_id).result()
+    
+    def transcribe_audio_async(self, audio_path: str, meeting_id: str) -> Future:
+        """
+        Submit audio for transcription without blocking on AssemblyAI's polling
+        
+        Args:
+            audio_path: Path to the local audio file
+            meeting_id: Unique identifier for the meeting
             
-            if transcript.status == aai.TranscriptStatus.error:
-                raise Exception(f"Transcription failed: {transcript.error}")
+        Returns:
+            Future resolving to a MeetingTranscript object
+        """
+        import assemblyai as aai
+        
+        logger.info("Starting transcription for meeting: %s", meeting_id)
+        
+        # Create transcription request (pass local file path directly); the SDK
+        # uploads and polls on its own worker thread. The upload streams the open
+        # file handle in chunks, so large recordings are never read into memory
+        sdk_future = aai.Transcriber().transcribe_async(
+            audio_path,
+            config=self.config
+        )
+        
+        result_future = Future()
+        
+        def _on_done(done):
+            try:
+                result_future.set_result(
+                    self._build_meeting_transcript(done.result(), audio_path, meeting_id)
+                )
+            except Exception as e:
+                logger.error("Error during transcription: %s", e)
+                result_future.set_exception(e)
+        
+        sdk_future.add_done_callback(_on_done)
+        return result_future
+    
+    def transcribe_many(self, jobs: List[Tuple[str, str]]) -> List[MeetingTranscript]:
+        """
+        Transcribe several audio files concurrently
+        
+        Args:
+            jobs: List of (audio_path, meeting_id) pairs
             
-            print(f"Transcription completed successfully")
+        Returns:
+            List of MeetingTranscript objects in the same order as jobs
+        """
+        futures = [self.transcribe_audio_async(audio_path, meeting_id) for audio_path, meeting_id in jobs]
+        return [future.result() for future in futures]
+    
+    def _build_meeting_transcript(self, transcript, audio_path: str, meeting_id: str) -> MeetingTranscript:
+        """
+        Convert a completed AssemblyAI transcript into a MeetingTranscript
+        
+        Args:
+            transcript: Completed AssemblyAI Transcript object
+            audio_path: Path to the local audio file
+            meeting_id: Unique identifier for the meeting
             
-            # Extract unique speakers from utterances
-            speaker_ids = set(utt.speaker for utt in transcript.utterances)
-            speakers = [
-                Speaker(
-                    speaker_id=speaker_id,
+        Returns:
+            MeetingTranscript object with transcription and speaker information
+        """
+        import assemblyai as aai
+        
+        if transcript.status == aai.TranscriptStatus.error:
+            raise Exception(f"Transcription failed: {transcript.error}")
+        
+        logger.info("Transcription completed successfully")
+        
+        # Extract unique speakers (in order of first appearance) and segments in one pass
+        speakers_seen: Dict[str, Speaker] = {}
+        segments = []
+        for utterance in transcript.utterances:
+            if utterance.speaker not in speakers_seen:
+                speakers_seen[utterance.speaker] = Speaker(
+                    speaker_id=utterance.speaker,
                     role=SpeakerRole.PARTICIPANT,
                     confidence=1.0  # No per-speaker confidence in utterances
                 )
-                for speaker_id in speaker_ids
-            ]
-            
-            # Extract segments
-            segments = []
-            for utterance in transcript.utterances:
-                segments.append(TranscriptionSegment(
-                    start=int(utterance.start),
-                    end=int(utterance.end),
-                    speaker=utterance.speaker,
-                    text=utterance.text,
-                    confidence=getattr(utterance, 'confidence', 1.0)
-                ))
-            
-            # Create meeting transcript
-            meeting_transcript = MeetingTranscript(
-                meeting_id=meeting_id,
-                audio_url=audio_path,  # Now this is the local path
-                duration=int(transcript.audio_duration * 1000),  # Convert to milliseconds
-                speakers=speakers,
-                segments=segments
-            )
-            
-            print(f"Processed {len(segments)} segments from {len(speakers)} speakers")
-            return meeting_transcript
-            
-        except Exception as e:
-            print(f"Error during transcription: {str(e)}")
-            raise
+            segments.append(TranscriptionSegment(
+                start=int(utterance.start),
+                end=int(utterance.end),
+                speaker=utterance.speaker,
+                text=utterance.text,
+                confidence=getattr(utterance, 'confidence', 1.0)
+            ))
+        speakers = list(speakers_seen.values())
+        
+        # Create meeting transcript
+        meeting_transcript = MeetingTranscript(
+            meeting_id=meeting_id,
+            audio_url=audio_path,  # Now this is the local path
+            duration=int(transcript.audio_duration * 1000),  # Convert to milliseconds
+            speakers=speakers,
+            segments=segments
+        )
+        
+        logger.info("Processed %s segments from %s speakers", len(segments), len(speakers))
+        return meeting_transcript
     
     def get_transcription_status(self, transcript_id: str) -> Dict[str, Any]:
         """
@@ -101,6 +160,8 @@ class AudioProcessor:
         Returns:
             Status information about the transcription
         """
+        import assemblyai as aai
+        
         try:
             transcript = aai.Transcript.get_by_id(transcript_id)
             return {
@@ -110,9 +171,156 @@ class AudioProcessor:
                 "error": transcript.error if transcript.status == aai.TranscriptStatus.error else None
             }
         except Exception as e:
-            print(f"Error getting transcription status: {str(e)}")
+            logger.error("Error getting transcription status: %s", e)
             raise
     
+    def _probe_duration(self, audio_path: str) -> Optional[float]:
+        """
+        Get the audio duration in seconds with ffprobe
+        
+        Args:
+            audio_path: Path to the audio file
+            
+        Returns:
+            Duration in seconds, or None if ffmpeg is unavailable or probing fails
+        """
+        if not (shutil.which("ffprobe") and shutil.which("ffmpeg")):
+            logger.warning("Warning: ffmpeg not found, audio chunking disabled")
+            return None
+        try:
+            output = subprocess.run(
+                ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+                 "-of", "default=noprint_wrappers=1:nokey=1", audio_path],
+                check=True, capture_output=True, text=True
+            ).stdout
+            return float(output.strip())
+        except (subprocess.CalledProcessError, ValueError) as e:
+            logger.warning("Warning: Could not probe audio duration: %s", e)
+            return None
+    
+    def _split_audio(self, audio_path: str, duration: float, chunk_secs: int, output_dir: str) -> List[Tuple[str, int]]:
+        """
+        Split audio into fixed-length chunks with ffmpeg stream copy (no re-encode)
+        
+        Args:
+            audio_path: Path to the audio file
+            duration: Audio duration in seconds
+            chunk_secs: Chunk length in seconds
+            output_dir: Directory to write the chunk files to
+            
+        Returns:
+            List of (chunk_path, offset in milliseconds) pairs
+        """
+        suffix = Path(audio_path).suffix
+        chunks = []
+        start = 0
+        while start < duration:
+            chunk_path = os.path.join(output_dir, f"chunk_{len(chunks):03d}{suffix}")
+            subprocess.run(
+                ["ffmpeg", "-v", "error", "-y", "-ss", str(start), "-t", str(chunk_secs),
+                 "-i", audio_path, "-c", "copy", chunk_path],
+                check=True, capture_output=True
+            )
+            chunks.append((chunk_path, start * 1000))
+            start += chunk_secs
+        return chunks
+    
+    def _transcribe_chunked(self, audio_path: str, meeting_id: str, duration: float, chunk_secs: int) -> MeetingTranscript:
+        """
+        Transcribe a long recording as parallel chunks and stitch the results
+        
+        Args:
+            audio_path: Path to the audio file
+            meeting_id: Unique identifier for the meeting
+            duration: Audio duration in seconds
+            chunk_secs: Chunk length in seconds
+            
+        Returns:
+            Single MeetingTranscript covering the whole recording
+        """
+        with tempfile.TemporaryDirectory(prefix="meeting_chunks_") as tmp_dir:
+            chunks = self._split_audio(audio_path, duration, chunk_secs, tmp_dir)
+            logger.info("Split audio into %s chunks of %s seconds", len(chunks), chunk_secs)
+            
+            futures = [
+                self.transcribe_audio_async(chunk_path, f"{meeting_id}-part{i}")
+                for i, (chunk_path, _) in enumerate(chunks)
+            ]
+            # Wait inside the temp dir context so chunk files outlive their upload
+            parts = [(future.result(), offset) for future, (_, offset) in zip(futures, chunks)]
+        
+        return self._merge_chunk_transcripts(parts, audio_path, meeting_id)
+    
+    def _merge_chunk_transcripts(self, parts: List[Tuple[MeetingTranscript, int]], audio_path: str, meeting_id: str) -> MeetingTranscript:
+        """
+        Stitch chunk transcripts into one, keeping speaker labels consistent across chunks
+        
+        Diarization labels are assigned independently per chunk, so speakers are
+        matched with a speaker-aware observation buffer: every global speaker keeps
+        its (chunk index, talk time) observations and is scored as
+        phi = sum(d * (1 + alpha * i / n)), favouring recent and talkative speakers.
+        Each chunk's speakers are ranked by talk time and assigned to the global
+        speakers in score order; any extra speakers get new labels.
+        
+        Args:
+            parts: List of (chunk transcript, offset in milliseconds) pairs in order
+            audio_path: Path to the original audio file
+            meeting_id: Unique identifier for the meeting
+            
+        Returns:
+            Merged MeetingTranscript
+        """
+        alpha = Config.SPEAKER_RECENCY_ALPHA
+        n = len(parts)
+        observations: Dict[str, List[Tuple[int, int]]] = {}
+        spare_labels = iter(string.ascii_uppercase)
+        
+        def new_label() -> str:
+            for label in spare_labels:
+                if label not in observations:
+                    return label
+            return f"S{len(observations) + 1}"
+        
+        def score(label: str) -> float:
+            return sum(d * (1 + alpha * i / n) for i, d in observations[label])
+        
+        segments = []
+        for i, (part, offset) in enumerate(parts):
+            # Talk time per local speaker in this chunk
+            talk_time = part.speaker_talk_time()
+            
+            local_ranked = sorted(talk_time, key=talk_time.get, reverse=True)
+            global_ranked = sorted(observations, key=score, reverse=True)
+            mapping = {}
+            for rank, local in enumerate(local_ranked):
+                label = global_ranked[rank] if rank < len(global_ranked) else (local if i == 0 else new_label())
+                observations.setdefault(label, []).append((i, talk_time[local]))
+                mapping[local] = label
+            
+            for segment in part.segments:
+                segments.append(TranscriptionSegment(
+                    start=segment.start + offset,
+                    end=segment.end + offset,
+                    speaker=mapping[segment.speaker],
+                    text=segment.text,
+                    confidence=segment.confidence
+                ))
+        
+        speakers = [
+            Speaker(speaker_id=label, role=SpeakerRole.PARTICIPANT, confidence=1.0)
+            for label in observations
+        ]
+        last_part, last_offset = parts[-1]
+        
+        logger.info("Merged %s chunks into %s segments from %s speakers", len(parts), len(segments), len(speakers))
+        return MeetingTranscript(
+            meeting_id=meeting_id,
+            audio_url=audio_path,
+            duration=last_offset + last_part.duration,
+            speakers=speakers,
+            segments=segments
+        )
+    
     def process_audio_file(self, audio_path: str, meeting_id: str) -> MeetingTranscript:
         """
         Complete audio processing pipeline: transcribe local file
@@ -124,10 +332,23 @@ class AudioProcessor:
         Returns:
             MeetingTranscript object
         """
-        print(f"Starting audio processing for meeting: {meeting_id}")
+        # Fail fast before any upload or ffmpeg work
+        path = Path(audio_path)
+        if not path.is_file():
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        if path.suffix.lower() not in Config.SUPPORTED_AUDIO_FORMATS:
+            raise ValueError(f"Unsupported audio format '{path.suffix}'. Supported formats: {', '.join(Config.SUPPORTED_AUDIO_FORMATS)}")
+        
+        logger.info("Starting audio processing for meeting: %s", meeting_id)
         
-        # Transcribe audio directly from local file
-        transcript = self.transcribe_audio(audio_path, meeting_id)
+        # Long recordings are split and transcribed chunk-by-chunk in parallel
+        chunk_secs = Config.AUDIO_CHUNK_SECONDS
+        duration = self._probe_duration(audio_path) if chunk_secs > 0 else None
+        if duration and duration > chunk_secs:
+            transcript = self._transcribe_chunked(audio_path, meeting_id, duration, chunk_secs)
+        else:
+            # Transcribe audio directly from local file
+            transcript = self.transcribe_audio(audio_path, meeting_id)
         
-        print(f"Audio processing completed for meeting: {meeting_id}")
+        logger.info("Audio processing completed for meeting: %s", meeting_id)
         return transcript 
\ No newline at end of file
@@ -1,9 +1,17 @@
-import os
-import json
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+import logging
+import random
+import re
+import threading
+import time
+import httplib2
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
@@ -11,54 +19,228 @@ from googleapiclient.errors import HttpError
 from config import Config
 from models import CalendarEvent
 
+logger = logging.getLogger(__name__)
+
+# Per-thread Calendar clients used for concurrent batch requests
+_thread_state = threading.local()
+
+# Calendar timezone applied to event start and end times, bound once at import
+_TZ_NAME = Config.GOOGLE_CALENDAR_TIMEZONE
+
+# Attendee addresses must look like local@domain.tld
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# HTTP statuses worth retrying with backoff
+_RETRIABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_UTC = timezone.utc
+
+def _as_utc(dt: datetime) -> datetime:
+    """Convert a datetime to aware UTC (naive values are taken as UTC)"""
+    return dt.replace(tzinfo=_UTC) if dt.tzinfo is None else dt.astimezone(_UTC)
+
+def _rfc3339(dt: datetime) -> str:
+    """Format a datetime as an RFC 3339 UTC timestamp"""
+    return _as_utc(dt).isoformat(timespec='seconds').replace('+00:00', 'Z')
+
+def _parse_rfc3339(value: str) -> datetime:
+    """Parse an RFC 3339 timestamp from the Calendar API (which uses a Z suffix) as aware UTC"""
+    return _as_utc(datetime.fromisoformat(value.replace('Z', '+00:00')))
+
+def _is_retriable(error: Exception) -> bool:
+    """Check whether an API error is a rate limit or transient server error"""
+    return isinstance(error, HttpError) and error.resp.status in _RETRIABLE_STATUSES
+
 class CalendarManager:
     """Handles Google Calendar integration for event creation"""
     
+    # Google allows at most 50 calls in a single batch request
+    BATCH_SIZE = 50
+    
+    # Socket timeout in seconds for Calendar API requests
+    HTTP_TIMEOUT = 60
+    
+    # Batch requests sent concurrently by create_events
+    MAX_WORKERS = 8
+    
+    # Retries for rate-limited (429) and transient server (5xx) errors
+    NUM_RETRIES = 5
+    RETRY_BASE_DELAY = 0.25
+    
+    # Partial-response masks limiting API responses to the fields we use
+    EVENT_FIELDS = "id,htmlLink,summary"
+    LIST_FIELDS = "items(id,summary,start,end,attendees/email,location,htmlLink),nextPageToken"
+    SYNC_FIELDS = "items(id,status,summary,start,end,attendees/email,location,htmlLink),nextPageToken,nextSyncToken"
+    
+    # Largest page requested when listing events
+    PAGE_SIZE = 250
+    
+    # Process-wide credentials and service shared by all instances
+    _AUTH_LOCK = threading.Lock()
+    _CREDS: Optional[Credentials] = None
+    _HTTP: Optional[AuthorizedHttp] = None
+    _SERVICE = None
+    
+    # Refresh access tokens this long before they expire
+    TOKEN_REFRESH_MARGIN = timedelta(seconds=60)
+    
     def __init__(self):
         """Initialize the calendar manager with Google Calendar API"""
         self.service = None
+        self.http = None
+        self._sync_token: Optional[str] = None
         self.authenticate()
     
     def authenticate(self):
-        """Authenticate with Google Calendar API"""
+        """
+        Authenticate with Google Calendar API
+        
+        Credentials and the built service are shared by all CalendarManager
+        instances in the process, so only the first one reads token.json.
+        """
         try:
-            creds = None
+            cls = CalendarManager
+            with cls._AUTH_LOCK:
+                if cls._SERVICE is None:
+                    creds = self._load_credentials()
+                    
+                    http, service = self._build_service(creds)
+                    cls._CREDS, cls._HTTP, cls._SERVICE = creds, http, service
+                    logger.info("Successfully authenticated with Google Calendar API")
+                elif self._expires_soon(cls._CREDS):
+                    # Refresh ahead of expiry rather than on a failing request
+                    cls._CREDS.refresh(Request())
+                    self._save_credentials(cls._CREDS)
+                
+                self.http = cls._HTTP
+                self.service = cls._SERVICE
             
-            # Check if token file exists
-            if os.path.exists(Config.GOOGLE_TOKEN_FILE):
-                creds = Credentials.from_authorized_user_file(
-                    Config.GOOGLE_TOKEN_FILE, 
-                    Config.GOOGLE_SCOPES
-                )
+        except Exception as e:
+            logger.error("Error authenticating with Google Calendar: %s", e)
+            raise
+    
+    def _build_service(self, creds: Credentials):
+        """
+        Build a Calendar API client on its own keep-alive transport
+        
+        Args:
+            creds: OAuth credentials
             
-            # If no valid credentials available, let user log in
-            if not creds or not creds.valid:
-                if creds and creds.expired and creds.refresh_token:
-                    creds.refresh(Request())
-                else:
-                    if not os.path.exists(Config.GOOGLE_CREDENTIALS_FILE):
-                        raise FileNotFoundError(
-                            f"Google credentials file not found: {Config.GOOGLE_CREDENTIALS_FILE}\n"
-                            "Please download your credentials.json from Google Cloud Console"
-                        )
-                    
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        Config.GOOGLE_CREDENTIALS_FILE, 
-                        Config.GOOGLE_SCOPES
+        Returns:
+            Tuple of (AuthorizedHttp, Calendar service)
+        """
+        # One explicit transport per client so every request made through it
+        # reuses the same TLS connection
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=self.HTTP_TIMEOUT))
+        # Load the discovery document bundled with googleapiclient instead of
+        # fetching it over the network on every start
+        service = build(
+            'calendar', 'v3',
+            http=http,
+            static_discovery=True,
+            cache_discovery=False
+        )
+        return http, service
+    
+    def _thread_service(self):
+        """
+        Get a Calendar service owned by the calling thread
+        
+        httplib2 connections are not thread-safe, so concurrent batches each
+        need their own client built from the shared credentials.
+        """
+        creds = CalendarManager._CREDS
+        if getattr(_thread_state, 'creds', None) is not creds:
+            _thread_state.creds = creds
+            _, _thread_state.service = self._build_service(creds)
+        return _thread_state.service
+    
+    def _load_credentials(self) -> Credentials:
+        """
+        Load OAuth credentials from token.json, refreshing or logging in as needed
+        
+        Returns:
+            Valid Credentials object
+        """
+        creds = None
+        
+        # Check if token file exists
+        if Config.GOOGLE_TOKEN_FILE.exists():
+            creds = Credentials.from_authorized_user_file(
+                Config.GOOGLE_TOKEN_FILE, 
+                Config.GOOGLE_SCOPES
+            )
+        
+        # If no valid credentials available, let user log in
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+            else:
+                if not Config.GOOGLE_CREDENTIALS_FILE.exists():
+                    raise FileNotFoundError(
+                        f"Google credentials file not found: {Config.GOOGLE_CREDENTIALS_FILE}\n"
+                        "Please download your credentials.json from Google Cloud Console"
                     )
-                    creds = flow.run_local_server(port=0)
                 
-                # Save the credentials for the next run
-                with open(Config.GOOGLE_TOKEN_FILE, 'w') as token:
-                    token.write(creds.to_json())
+                flow = InstalledAppFlow.from_client_secrets_file(
+                    Config.GOOGLE_CREDENTIALS_FILE, 
+                    Config.GOOGLE_SCOPES
+                )
+                creds = flow.run_local_server(port=0)
             
-            # Build the service
-            self.service = build('calendar', 'v3', credentials=creds)
-            print("Successfully authenticated with Google Calendar API")
+            # Save the credentials for the next run
+            self._save_credentials(creds)
+        
+        return creds
+    
+    def _save_credentials(self, creds: Credentials):
+        """Write credentials to token.json for the next run"""
+        Config.GOOGLE_TOKEN_FILE.write_text(creds.to_json())
+    
+    def _expires_soon(self, creds: Credentials) -> bool:
+        """Check whether refreshable credentials expire within TOKEN_REFRESH_MARGIN"""
+        if not creds.refresh_token or creds.expiry is None:
+            return False
+        # google-auth stores expiry as a naive UTC datetime
+        return creds.expiry - self.TOKEN_REFRESH_MARGIN <= datetime.now(_UTC).replace(tzinfo=None)
+    
+    def _build_event_body(self, event: CalendarEvent) -> Dict[str, Any]:
+        """
+        Build the Calendar API request body for an event
+        
+        Args:
+            event: CalendarEvent object
             
-        except Exception as e:
-            print(f"Error authenticating with Google Calendar: {str(e)}")
-            raise
+        Returns:
+            Event resource dictionary
+        """
+        event_data = {
+            'summary': event.summary,
+            'description': event.description,
+            'start': {
+                'dateTime': event.start_time.isoformat(),
+                'timeZone': _TZ_NAME,
+            },
+            'end': {
+                'dateTime': event.end_time.isoformat(),
+                'timeZone': _TZ_NAME,
+            },
+            'reminders': event.reminders,
+        }
+        
+        # Add attendees if provided and valid
+        if event.attendees:
+            valid_attendees = list(filter(_EMAIL_RE.match, event.attendees))
+            if valid_attendees:
+                event_data['attendees'] = [
+                    {'email': email} for email in valid_attendees
+                ]
+        
+        # Add location if provided
+        if event.location:
+            event_data['location'] = event.location
+        
+        return event_data
     
     def create_event(self, event: CalendarEvent) -> Dict[str, Any]:
         """
@@ -74,48 +256,24 @@ class CalendarManager:
             if not self.service:
                 raise Exception("Calendar service not initialized")
             
-            # Prepare event data
-            event_data = {
-                'summary': event.summary,
-                'description': event.description,
-                'start': {
-                    'dateTime': event.start_time.isoformat(),
-                    'timeZone': Config.GOOGLE_CALENDAR_TIMEZONE,
-                },
-                'end': {
-                    'dateTime': event.end_time.isoformat(),
-                    'timeZone': Config.GOOGLE_CALENDAR_TIMEZONE,
-                },
-                'reminders': event.reminders,
-            }
-            
-            # Add attendees if provided and valid
-            if event.attendees:
-                valid_attendees = [email for email in event.attendees if isinstance(email, str) and '@' in email]
-                if valid_attendees:
-                    event_data['attendees'] = [
-                        {'email': email} for email in valid_attendees
-                    ]
-            
-            # Add location if provided
-            if event.location:
-                event_data['location'] = event.location
+            event_data = self._build_event_body(event)
             
             # Create the event
             created_event = self.service.events().insert(
                 calendarId='primary',
                 body=event_data,
-                sendUpdates='all'  # Send invitations to attendees
-            ).execute()
+                sendUpdates='all',  # Send invitations to attendees
+                fields=self.EVENT_FIELDS
+            ).execute(num_retries=self.NUM_RETRIES)
             
-            print(f"Calendar event created: {created_event.get('htmlLink')}")
+            logger.info("Calendar event created: %s", created_event.get('htmlLink'))
             return created_event
             
         except HttpError as error:
-            print(f"Error creating calendar event: {error}")
+            logger.error("Error creating calendar event: %s", error)
             raise
         except Exception as e:
-            print(f"Unexpected error creating calendar event: {str(e)}")
+            logger.error("Unexpected error creating calendar event: %s", e)
             raise
     
     def create_events(self, events: List[CalendarEvent]) -> List[Dict[str, Any]]:
@@ -128,32 +286,92 @@ class CalendarManager:
         Returns:
             List of created event data
         """
-        created_events = []
+        if not self.service:
+            logger.error("Failed to create events: Calendar service not initialized")
+            return []
+        if not events:
+            return []
         
-        for event in events:
-            try:
-                created_event = self.create_event(event)
-                created_events.append(created_event)
-            except Exception as e:
-                print(f"Failed to create event '{event.summary}': {str(e)}")
-                continue
+        results: List[Optional[Dict[str, Any]]] = [None] * len(events)
+        pending = list(enumerate(events))
         
-        print(f"Successfully created {len(created_events)} out of {len(events)} events")
+        for attempt in range(self.NUM_RETRIES + 1):
+            can_retry = attempt < self.NUM_RETRIES
+            retry: List[int] = []
+            
+            def _on_create(request_id, response, exception):
+                index = int(request_id)
+                if exception is not None:
+                    if can_retry and _is_retriable(exception):
+                        retry.append(index)
+                    else:
+                        logger.error("Failed to create event '%s': %s", events[index].summary, exception)
+                    return
+                results[index] = response
+                logger.debug("Calendar event created: %s", response.get('htmlLink'))
+            
+            def _execute_chunk(chunk):
+                service = self._thread_service()
+                batch = service.new_batch_http_request(callback=_on_create)
+                for index, event in chunk:
+                    batch.add(
+                        service.events().insert(
+                            calendarId='primary',
+                            body=self._build_event_body(event),
+                            sendUpdates='all',  # Send invitations to attendees
+                            fields=self.EVENT_FIELDS
+                        ),
+                        request_id=str(index)
+                    )
+                
+                try:
+                    batch.execute()
+                except Exception as e:
+                    if can_retry and _is_retriable(e):
+                        retry.extend(index for index, _ in chunk)
+                    else:
+                        logger.error("Batch event creation failed: %s", e)
+            
+            # Queue inserts into batch requests so N events cost one round trip per
+            # BATCH_SIZE events instead of one each; several batches run in parallel
+            indexed_events = iter(pending)
+            chunks = list(iter(lambda: list(islice(indexed_events, self.BATCH_SIZE)), []))
+            if len(chunks) == 1:
+                _execute_chunk(chunks[0])
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(chunks))) as pool:
+                    list(pool.map(_execute_chunk, chunks))
+            
+            if not retry:
+                break
+            
+            # Back off exponentially (with jitter) before retrying rate-limited
+            # or transiently failed inserts
+            pending = [(index, events[index]) for index in sorted(retry)]
+            delay = self.RETRY_BASE_DELAY * 2 ** attempt + random.random() * 0.1
+            logger.warning("Retrying %s calendar events in %.2f seconds", len(pending), delay)
+            time.sleep(delay)
+        
+        created_events = [event for event in results if event is not None]
+        logger.info("Successfully created %s out of %s events", len(created_events), len(events))
         return created_events
     
-    def list_events(self, time_min: Optional[datetime] = None, 
-                   time_max: Optional[datetime] = None, 
-                   max_results: int = 10) -> List[Dict[str, Any]]:
+    def iter_events(self, time_min: Optional[datetime] = None,
+                    time_max: Optional[datetime] = None,
+                    page_size: int = PAGE_SIZE) -> Iterator[Dict[str, Any]]:
         """
-        List calendar events
+        Iterate over calendar events, fetching one page at a time
+        
+        Pages are requested lazily, so callers that stop early only pay for
+        the pages they consumed.
         
         Args:
             time_min: Start time for event search
             time_max: End time for event search
-            max_results: Maximum number of events to return
+            page_size: Number of events requested per page (Google caps this at 2500)
             
-        Returns:
-            List of event data
+        Yields:
+            Event data
         """
         try:
             if not self.service:
@@ -161,29 +379,97 @@ class CalendarManager:
             
             # Set default time range if not provided
             if not time_min:
-                time_min = datetime.utcnow()
+                time_min = datetime.now(_UTC)
             if not time_max:
                 time_max = time_min + timedelta(days=7)
             
-            events_result = self.service.events().list(
-                calendarId='primary',
-                timeMin=time_min.isoformat() + 'Z',
-                timeMax=time_max.isoformat() + 'Z',
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            return events
+            page_token = None
+            while True:
+                events_result = self.service.events().list(
+                    calendarId='primary',
+                    timeMin=_rfc3339(time_min),
+                    timeMax=_rfc3339(time_max),
+                    maxResults=page_size,
+                    pageToken=page_token,
+                    singleEvents=True,
+                    orderBy='startTime',
+                    fields=self.LIST_FIELDS
+                ).execute(num_retries=self.NUM_RETRIES)
+                
+                yield from events_result.get('items', [])
+                
+                page_token = events_result.get('nextPageToken')
+                if not page_token:
+                    break
             
         except HttpError as error:
-            print(f"Error listing calendar events: {error}")
+            logger.error("Error listing calendar events: %s", error)
             raise
         except Exception as e:
-            print(f"Unexpected error listing calendar events: {str(e)}")
+            logger.error("Unexpected error listing calendar events: %s", e)
             raise
     
+    def iter_changed_events(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over events changed since the previous call (incremental sync)
+        
+        The first call performs a full sync of the calendar; later calls use the
+        stored sync token so only added, updated or cancelled events are returned.
+        Cancelled events carry status 'cancelled'. The sync token is only advanced
+        once the final page has been consumed.
+        
+        Yields:
+            Event data
+        """
+        if not self.service:
+            raise Exception("Calendar service not initialized")
+        
+        page_token = None
+        while True:
+            params = {
+                'calendarId': 'primary',
+                'pageToken': page_token,
+                'fields': self.SYNC_FIELDS,
+            }
+            if self._sync_token:
+                params['syncToken'] = self._sync_token
+            
+            try:
+                events_result = self.service.events().list(**params).execute(num_retries=self.NUM_RETRIES)
+            except HttpError as error:
+                # 410 Gone: the sync token expired, start over with a full sync
+                if error.resp.status == 410 and self._sync_token:
+                    logger.warning("Calendar sync token expired, performing full sync")
+                    self._sync_token = None
+                    page_token = None
+                    continue
+                logger.error("Error syncing calendar events: %s", error)
+                raise
+            
+            yield from events_result.get('items', [])
+            
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                self._sync_token = events_result.get('nextSyncToken')
+                break
+    
+    def list_events(self, time_min: Optional[datetime] = None, 
+                   time_max: Optional[datetime] = None, 
+                   max_results: int = 10) -> List[Dict[str, Any]]:
+        """
+        List calendar events
+        
+        Args:
+            time_min: Start time for event search
+            time_max: End time for event search
+            max_results: Maximum number of events to return
+            
+        Returns:
+            List of event data
+        """
+        events = self.iter_events(time_min, time_max, page_size=min(max_results, self.PAGE_SIZE))
+        return list(islice(events, max_results))
+    
     def delete_event(self, event_id: str) -> bool:
         """
         Delete a calendar event
@@ -201,16 +487,16 @@ class CalendarManager:
             self.service.events().delete(
                 calendarId='primary',
                 eventId=event_id
-            ).execute()
+            ).execute(num_retries=self.NUM_RETRIES)
             
-            print(f"Event {event_id} deleted successfully")
+            logger.info("Event %s deleted successfully", event_id)
             return True
             
         except HttpError as error:
-            print(f"Error deleting calendar event: {error}")
+            logger.error("Error deleting calendar event: %s", error)
             return False
         except Exception as e:
-            print(f"Unexpected error deleting calendar event: {str(e)}")
+            logger.error("Unexpected error deleting calendar event: %s", e)
             return False
     
     def update_event(self, event_id: str, event: CalendarEvent) -> Dict[str, Any]:
@@ -228,47 +514,25 @@ class CalendarManager:
             if not self.service:
                 raise Exception("Calendar service not initialized")
             
-            # Prepare event data
-            event_data = {
-                'summary': event.summary,
-                'description': event.description,
-                'start': {
-                    'dateTime': event.start_time.isoformat(),
-                    'timeZone': Config.GOOGLE_CALENDAR_TIMEZONE,
-                },
-                'end': {
-                    'dateTime': event.end_time.isoformat(),
-                    'timeZone': Config.GOOGLE_CALENDAR_TIMEZONE,
-                },
-                'reminders': event.reminders,
-            }
-            
-            # Add attendees if provided
-            if event.attendees:
-                event_data['attendees'] = [
-                    {'email': email} for email in event.attendees
-                ]
-            
-            # Add location if provided
-            if event.location:
-                event_data['location'] = event.location
+            event_data = self._build_event_body(event)
             
             # Update the event
             updated_event = self.service.events().update(
                 calendarId='primary',
                 eventId=event_id,
                 body=event_data,
-                sendUpdates='all'
-            ).execute()
+                sendUpdates='all',
+                fields=self.EVENT_FIELDS
+            ).execute(num_retries=self.NUM_RETRIES)
             
-            print(f"Calendar event updated: {updated_event.get('htmlLink')}")
+            logger.info("Calendar event updated: %s", updated_event.get('htmlLink'))
             return updated_event
             
         except HttpError as error:
-            print(f"Error updating calendar event: {error}")
+            logger.error("Error updating calendar event: %s", error)
             raise
         except Exception as e:
-            print(f"Unexpected error updating calendar event: {str(e)}")
+            logger.error("Unexpected error updating calendar event: %s", e)
             raise
     
     def check_availability(self, start_time: datetime, end_time: datetime) -> bool:
@@ -283,9 +547,77 @@ class CalendarManager:
             True if available, False if conflicting events exist
         """
         try:
-            events = self.list_events(start_time, end_time, max_results=1)
-            return len(events) == 0
+            if not self.service:
+                raise Exception("Calendar service not initialized")
+            
+            # FreeBusy returns only busy intervals, which is all we need here
+            body = {
+                'timeMin': _rfc3339(start_time),
+                'timeMax': _rfc3339(end_time),
+                'items': [{'id': 'primary'}],
+            }
+            result = self.service.freebusy().query(
+                body=body,
+                fields="calendars/primary/busy"
+            ).execute(num_retries=self.NUM_RETRIES)
+            
+            return not result['calendars']['primary'].get('busy')
             
         except Exception as e:
-            print(f"Error checking availability: {str(e)}")
-            return False 
\ No newline at end of file
+            logger.error("Error checking availability: %s", e)
+            return False
+    
+    def check_availability_bulk(self, slots: List[Tuple[datetime, datetime]]) -> List[bool]:
+        """
+        Check several time slots with a single FreeBusy query
+        
+        Args:
+            slots: List of (start_time, end_time) tuples to check
+            
+        Returns:
+            List of availability flags in the same order as slots (all False if the query fails)
+        """
+        if not slots:
+            return []
+        
+        if not self.service:
+            logger.error("Error checking availability: Calendar service not initialized")
+            return [False] * len(slots)
+        
+        # Query the envelope of all slots once and test each slot locally
+        body = {
+            'timeMin': _rfc3339(min(start for start, _ in slots)),
+            'timeMax': _rfc3339(max(end for _, end in slots)),
+            'items': [{'id': 'primary'}],
+        }
+        try:
+            result = self.service.freebusy().query(
+                body=body,
+                fields="calendars/primary/busy"
+            ).execute(num_retries=self.NUM_RETRIES)
+        except (HttpError, OSError) as e:
+            # Only a failed query means "unknown"; parsing errors below are bugs and propagate
+            logger.error("Error checking availability: %s", e)
+            return [False] * len(slots)
+        
+        # Merge busy intervals into sorted, disjoint ranges for bisection
+        busy_starts: List[datetime] = []
+        busy_ends: List[datetime] = []
+        busy = sorted(
+            (_parse_rfc3339(b['start']), _parse_rfc3339(b['end']))
+            for b in result['calendars']['primary'].get('busy', [])
+        )
+        for busy_start, busy_end in busy:
+            if busy_ends and busy_start <= busy_ends[-1]:
+                busy_ends[-1] = max(busy_ends[-1], busy_end)
+            else:
+                busy_starts.append(busy_start)
+                busy_ends.append(busy_end)
+        
+        availability = []
+        for start_time, end_time in slots:
+            start_time, end_time = _as_utc(start_time), _as_utc(end_time)
+            # First busy range ending after the slot starts is the only candidate overlap
+            i = bisect_right(busy_ends, start_time)
+            availability.append(i == len(busy_starts) or busy_starts[i] >= end_time)
+        return availability
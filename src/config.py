@@ -17,8 +17,8 @@ class Config:
     ASSEMBLYAI_BASE_URL: str = "https://api.assemblyai.com/v2"
     
     # Google Calendar Configuration
-    GOOGLE_CREDENTIALS_FILE = os.path.join(BASE_DIR, 'config', 'credentials.json')
-    GOOGLE_TOKEN_FILE = os.path.join(BASE_DIR, 'config', 'token.json')
+    GOOGLE_CREDENTIALS_FILE: Path = BASE_DIR / 'config' / 'credentials.json'
+    GOOGLE_TOKEN_FILE: Path = BASE_DIR / 'config' / 'token.json'
     GOOGLE_SCOPES: list = [
         "https://www.googleapis.com/auth/calendar",
         "https://www.googleapis.com/auth/calendar.events"
@@ -28,10 +28,29 @@ class Config:
     # Ollama Configuration
     OLLAMA_BASE_URL = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
     OLLAMA_MODEL = os.getenv('OLLAMA_MODEL', 'llama3.2')
+    # Optional quantized model tag (e.g. llama3.2:3b-instruct-q4_K_M), used instead of
+    # OLLAMA_MODEL unless it fails a structured-output check on first use
+    OLLAMA_MODEL_QUANT = os.getenv('OLLAMA_MODEL_QUANT', '')
+    # LLM server type at OLLAMA_BASE_URL: "ollama", or "llama_cpp" for a llama.cpp llama-server
+    LLM_BACKEND: str = os.getenv('LLM_BACKEND', 'ollama').lower()
+    # Concurrent requests sent to Ollama; raise it only together with the server's OLLAMA_NUM_PARALLEL
+    OLLAMA_NUM_PARALLEL: int = int(os.getenv('OLLAMA_NUM_PARALLEL', '1'))
+    # Comma-separated Ollama servers to spread requests over (defaults to OLLAMA_BASE_URL)
+    OLLAMA_ENDPOINTS: list = [
+        url.strip().rstrip('/') for url in os.getenv('OLLAMA_ENDPOINTS', '').split(',') if url.strip()
+    ] or [OLLAMA_BASE_URL]
+    # Seconds before cached LLM results expire (0 keeps them forever)
+    LLM_CACHE_TTL_SECONDS: int = int(os.getenv('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+    # Approximate token budget for transcript text in prompts (0 sends the full transcript unchanged)
+    LLM_MAX_TRANSCRIPT_TOKENS: int = int(os.getenv('LLM_MAX_TRANSCRIPT_TOKENS', '0'))
     
     # Audio Processing Configuration
     SUPPORTED_AUDIO_FORMATS: list = [".mp3", ".wav", ".m4a", ".flac"]
     MAX_AUDIO_DURATION: int = 3600  # 1 hour in seconds
+    # Split audio longer than this into chunks transcribed in parallel (0 disables, requires ffmpeg)
+    AUDIO_CHUNK_SECONDS: int = int(os.getenv("AUDIO_CHUNK_SECONDS", "0"))
+    # Recency weight used when matching speakers across chunks
+    SPEAKER_RECENCY_ALPHA: float = 0.5
     
     # Meeting Minutes Configuration
     MINUTES_TEMPLATE: str = """
@@ -54,21 +73,32 @@ class Config:
     {next_steps}
     """
     
-    # Output directories
-    OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
-    TRANSCRIPTS_DIR = os.path.join(OUTPUT_DIR, 'transcripts')
-    MINUTES_DIR = os.path.join(OUTPUT_DIR, 'minutes')
+    # Output directories (resolved once so per-meeting paths are a single join)
+    OUTPUT_DIR: Path = (BASE_DIR / 'output').resolve()
+    TRANSCRIPTS_DIR: Path = OUTPUT_DIR / 'transcripts'
+    MINUTES_DIR: Path = OUTPUT_DIR / 'minutes'
+    CACHE_DIR: Path = OUTPUT_DIR / 'cache'
+    
+    # One-shot guards so repeated calls skip the filesystem checks
+    _directories_ready: bool = False
+    _config_valid: Optional[bool] = None
     
     # Create output directories if they don't exist
     @classmethod
     def ensure_directories(cls):
-        """Ensure all output directories exist"""
-        for directory in [cls.OUTPUT_DIR, cls.TRANSCRIPTS_DIR, cls.MINUTES_DIR]:
-            os.makedirs(directory, exist_ok=True)
+        """Ensure all output directories exist (only touches the filesystem once)"""
+        if cls._directories_ready:
+            return
+        for directory in [cls.OUTPUT_DIR, cls.TRANSCRIPTS_DIR, cls.MINUTES_DIR, cls.CACHE_DIR]:
+            directory.mkdir(parents=True, exist_ok=True)
+        cls._directories_ready = True
     
     @classmethod
     def validate_config(cls) -> bool:
-        """Validate that required configuration is present"""
+        """Validate that required configuration is present (checked once per process)"""
+        if cls._config_valid is not None:
+            return cls._config_valid
+        
         cls.ensure_directories()
         
         missing = []
@@ -76,11 +106,11 @@ class Config:
         if not cls.ASSEMBLYAI_API_KEY:
             missing.append("ASSEMBLYAI_API_KEY")
         
-        if not os.path.exists(cls.GOOGLE_CREDENTIALS_FILE):
+        if not cls.GOOGLE_CREDENTIALS_FILE.exists():
             missing.append("Google credentials file")
         
         if missing:
             print(f"Warning: Missing configuration: {', '.join(missing)}")
-            return False
         
-        return True 
+        cls._config_valid = not missing
+        return cls._config_valid
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class LLMCache:
+    """Persistent on-disk cache for LLM results keyed by a hash of their inputs"""
+
+    def __init__(self, cache_file: Optional[str] = None, ttl: Optional[int] = None):
+        """
+        Initialize the cache and load existing entries
+
+        Args:
+            cache_file: Optional path to the JSON cache file (defaults to the cache directory)
+            ttl: Seconds before an entry expires (defaults to Config.LLM_CACHE_TTL_SECONDS, 0 never expires)
+        """
+        self.cache_file = cache_file or str(Config.CACHE_DIR / 'llm_cache.json')
+        self.ttl = Config.LLM_CACHE_TTL_SECONDS if ttl is None else ttl
+        # Create the cache directory once up front instead of on every save
+        if cache_file:
+            os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok=True)
+        else:
+            Config.ensure_directories()
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        Build a cache key from the content that determines an LLM result
+
+        Args:
+            parts: Strings identifying the task and its input (e.g. task name, model, transcript)
+
+        Returns:
+            Hex digest of the parts
+        """
+        digest = hashlib.blake2b(digest_size=32)
+        for part in parts:
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _load(self) -> dict:
+        """Load cache entries from disk, starting empty if the file is missing or corrupt"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            return self._prune(entries) if isinstance(entries, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Warning: Could not read LLM cache %s: %s", self.cache_file, e)
+            return {}
+
+    def _expired(self, entry: dict, now: float) -> bool:
+        """Whether an entry is older than the TTL"""
+        return bool(self.ttl) and now - entry.get("t", 0) > self.ttl
+
+    def _prune(self, entries: dict) -> dict:
+        """Drop malformed and expired entries so the file doesn't grow without bound"""
+        now = time.time()
+        return {
+            key: entry for key, entry in entries.items()
+            if isinstance(entry, dict) and "v" in entry and not self._expired(entry, now)
+        }
+
+    def _save(self):
+        """Prune expired entries and write the rest to disk atomically (caller must hold the lock)"""
+        self._entries = self._prune(self._entries)
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_file, self.cache_file)
+
+    def get(self, key: str) -> Any:
+        """
+        Get a cached result
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached value, or None if not cached or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if not isinstance(entry, dict) or "v" not in entry:
+            return None
+        if self._expired(entry, time.time()):
+            return None
+        return entry["v"]
+
+    def set(self, key: str, value: Any):
+        """
+        Store a JSON-serializable result and persist the cache
+
+        Args:
+            key: Cache key from make_key
+            value: Result to cache
+        """
+        with self._lock:
+            self._entries[key] = {"t": time.time(), "v": value}
+            try:
+                self._save()
+            except OSError as e:
+                logger.warning("Warning: Could not write LLM cache %s: %s", self.cache_file, e)
+
+    def get_or_compute(self, key: str, fn: Callable[[], Any], force_refresh: bool = False) -> Any:
+        """
+        Return the cached result for key, computing and storing it on a miss
+
+        Args:
+            key: Cache key from make_key
+            fn: Function producing the result; exceptions propagate and nothing is cached
+            force_refresh: Ignore any cached result and recompute it
+
+        Returns:
+            Cached or freshly computed result (empty results are returned but not cached)
+        """
+        value = None if force_refresh else self.get(key)
+        if value is None:
+            value = fn()
+            if value:
+                self.set(key, value)
+        return value
@@ -1,209 +1,683 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from typing import List, Dict, Any, Optional
+import logging
+try:
+    import orjson
+except ImportError:  # optional faster JSON parser
+    orjson = None
+try:
+    import tiktoken
+except ImportError:  # optional exact token counting
+    tiktoken = None
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import re
+import textwrap
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from config import Config
-from models import MeetingTranscript, MeetingMinutes, ActionItem, Decision, CalendarEvent
+from llm_cache import LLMCache
+from models import MeetingTranscript, MeetingMinutes, ActionItem, Decision, CalendarEvent, format_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Parse LLM output with orjson when available, falling back to the stdlib
+if orjson is not None:
+    _json_loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+else:
+    _json_loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
+# System prompt shared by every transcript analysis call. Prompts put the
+# transcript first and the task last, so calls over the same transcript share
+# a common prefix that Ollama/llama.cpp can reuse from the KV cache.
+_ANALYSIS_SYSTEM_PROMPT = (
+    "You are an expert meeting assistant. You will be given a meeting transcript "
+    "followed by a task. Complete the task using only the transcript and reply with JSON only."
+)
+
+def _analysis_prompt(transcript_text: str, task: str) -> str:
+    """
+    Build a prompt with the transcript as a stable prefix and the task after it
+    
+    Args:
+        transcript_text: Formatted transcript text
+        task: Task instructions and expected JSON format
+        
+    Returns:
+        Prompt text
+    """
+    return f"<TRANSCRIPT>\n{transcript_text}\n</TRANSCRIPT>\n\n<TASK>\n{task}\n</TASK>"
+
+# Prompt sections shared by the individual analysis calls and the combined
+# single-pass prompt, so both always ask for the same thing
+_MINUTES_INSTRUCTIONS = """Focus on:
+1. Key points discussed
+2. Action items with assignees and due dates
+3. Decisions made with rationale
+4. Next steps
+
+Be concise but thorough. Extract specific dates, times, and commitments mentioned."""
+
+_SPEAKER_INSTRUCTIONS = (
+    "Infer the most likely real names for each speaker label by analyzing the context of greetings, references, and replies. "
+    "Do NOT assign a name to a speaker just because their name is mentioned in a greeting. "
+    "Instead, deduce the mapping by observing how speakers address each other and how names are reciprocated in conversation. "
+    "For example, if Speaker A says 'Hey Jessica!' and Speaker B replies 'I'm doing great, Tom', then Speaker A is Tom and Speaker B is Jessica. "
+    "If a name cannot be determined with reasonable confidence, keep the original label."
+)
+
+_EVENTS_INSTRUCTIONS = (
+    "Only include events that have specific dates and times mentioned. "
+    "If no clear events are found, return an empty events array."
+)
+
+# JSON shape requested for meeting minutes
+_MINUTES_JSON_FORMAT = """{
+    "key_points": ["point1", "point2", ...],
+    "action_items": [
+        {
+            "description": "action item description",
+            "assignee": "person name or 'TBD'",
+            "due_date": "YYYY-MM-DD or null",
+            "priority": "low/medium/high"
+        }
+    ],
+    "decisions": [
+        {
+            "topic": "decision topic",
+            "decision": "what was decided",
+            "rationale": "why this decision was made"
+        }
+    ],
+    "next_steps": ["step1", "step2", ...],
+    "summary": "brief summary of the meeting"
+}"""
+
+# JSON shape requested for a single calendar event
+_EVENT_JSON_FORMAT = """{
+    "summary": "event title",
+    "description": "event description",
+    "start_time": "YYYY-MM-DD HH:MM",
+    "end_time": "YYYY-MM-DD HH:MM",
+    "attendees": ["email1@example.com", "email2@example.com"],
+    "location": "meeting location or null"
+}"""
+
+_EVENTS_JSON_FORMAT = f"""{{
+    "events": [
+{textwrap.indent(_EVENT_JSON_FORMAT, ' ' * 8)}
+    ]
+}}"""
+
+# JSON shape requested by the combined single-pass analysis
+_COMBINED_JSON_FORMAT = f"""{{
+    "speaker_names": {{"A": "inferred name or original label", ...}},
+    "minutes": {textwrap.indent(_MINUTES_JSON_FORMAT, ' ' * 4).lstrip()},
+    "events": [
+{textwrap.indent(_EVENT_JSON_FORMAT, ' ' * 8)}
+    ]
+}}"""
+
+# Characters that can change brace depth or string state while scanning JSON
+_JSON_STRUCTURE_RE = re.compile(r'[{}"\\]')
+
+# Generation limits per task; responses are JSON so anything past these is rambling
+_MAX_TOKENS_MINUTES = 4000
+_MAX_TOKENS_EVENTS = 800
+_MAX_TOKENS_SPEAKERS = 300
+_MAX_TOKENS_COMBINED = _MAX_TOKENS_MINUTES + _MAX_TOKENS_EVENTS + _MAX_TOKENS_SPEAKERS
+_JSON_STOP = ["\n\n\n"]
+
+# Fallback parsing patterns for responses that are not valid JSON
+_SUMMARY_RE = re.compile(r'summary[:\s]+(.+?)(?:\n|$)', re.IGNORECASE)
+_BULLET_FIRSTCHARS = frozenset("-•*")
+
+# Utterances carrying no content, dropped before sending transcripts to the LLM
+# Pure disfluencies only; short replies like "okay" or "yeah" often carry agreement to a decision
+_FILLER_UTTERANCES = frozenset({"um", "uh", "hmm"})
+_FILLER_PUNCTUATION = ".,!?… "
+
+if tiktoken is not None:
+    _TOKEN_ENCODING = tiktoken.get_encoding("cl100k_base")
+
+    def _estimate_tokens(text: str) -> int:
+        return len(_TOKEN_ENCODING.encode(text))
+else:
+    def _estimate_tokens(text: str) -> int:
+        # Roughly four characters per token for English text
+        return len(text) // 4
+
+class _JsonScanner:
+    """
+    Incremental brace matcher for a JSON object arriving in pieces
+    
+    Braces inside string values are ignored. The regex jumps straight to the
+    next structural character, so long runs of plain text are skipped in C.
+    """
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escape_pending = False
+    
+    def feed(self, text: str, start: int = 0) -> int:
+        """
+        Scan text[start:] and return the index of the brace that closes the
+        outermost object, or -1 if it has not closed yet
+        """
+        escaped_at = start if self.escape_pending else -1
+        self.escape_pending = False
+        for match in _JSON_STRUCTURE_RE.finditer(text, start):
+            i = match.start()
+            if i == escaped_at:
+                continue
+            char = text[i]
+            if self.in_string:
+                if char == '\\':
+                    escaped_at = i + 1
+                    self.escape_pending = escaped_at == len(text)
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == '{':
+                self.depth += 1
+            elif char == '}' and self.depth:
+                self.depth -= 1
+                if self.depth == 0:
+                    return i
+        return -1
+
+def _scan_json_end(text: str, start: int) -> int:
+    """
+    Find the brace closing the JSON object that opens at text[start]
+    
+    Args:
+        text: Text containing the JSON object
+        start: Index of the opening brace
+        
+    Returns:
+        Index of the matching closing brace, or -1 if the object never closes
+    """
+    return _JsonScanner().feed(text, start)
 
 class LLMProcessor:
     """Handles LLM processing using Ollama with Llama 3.2 for meeting analysis"""
     
-    def __init__(self):
-        """Initialize the LLM processor with Ollama configuration"""
+    # Consecutive failures before an endpoint is taken out of rotation, and for how long
+    CIRCUIT_FAILURE_THRESHOLD = 3
+    CIRCUIT_QUARANTINE_SECONDS = 30.0
+    
+    # Connection check shared by all processors in the process, run lazily before the first call
+    HEALTH_CHECK_INTERVAL = 60.0
+    _healthy = False
+    _last_health_check: Optional[float] = None
+    
+    # Structured-output check result per quantized model tag, run lazily before its first call
+    _structured_output_ok: Dict[str, bool] = {}
+    
+    def __init__(self, model_variant: Optional[str] = None):
+        """
+        Initialize the LLM processor with Ollama configuration
+        
+        Args:
+            model_variant: Quantized model tag to use instead of Config.OLLAMA_MODEL
+                (defaults to Config.OLLAMA_MODEL_QUANT)
+        """
         self.base_url = Config.OLLAMA_BASE_URL
-        self.model = Config.OLLAMA_MODEL
+        self.model = model_variant or Config.OLLAMA_MODEL_QUANT or Config.OLLAMA_MODEL
+        
+        # Cap in-flight generations per Ollama server; extra requests only make the GPU thrash
+        self.endpoints = list(Config.OLLAMA_ENDPOINTS)
+        self._endpoint_slots = {
+            url: threading.BoundedSemaphore(max(1, Config.OLLAMA_NUM_PARALLEL)) for url in self.endpoints
+        }
+        self._endpoint_failures = dict.fromkeys(self.endpoints, 0)
+        self._endpoint_quarantine = dict.fromkeys(self.endpoints, 0.0)
+        self._endpoint_lock = threading.Lock()
+        self._next_index = 0
+        self.cache = LLMCache()
         
-        # Test connection to Ollama
-        self._test_connection()
+        # Persistent session so every Ollama call reuses pooled keep-alive connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=frozenset({"GET", "POST"})
+            )
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Quantized models are verified on first use (see _ensure_model), not at construction
+        self._model_lock = threading.Lock()
+    
+    def close(self):
+        """Close pooled HTTP connections to Ollama"""
+        self.session.close()
     
-    def _test_connection(self):
-        """Test connection to Ollama service"""
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _ensure_connection(self):
+        """Test the connection before the first call, retrying at most once per HEALTH_CHECK_INTERVAL until it succeeds"""
+        if LLMProcessor._healthy:
+            return
+        now = time.monotonic()
+        last_check = LLMProcessor._last_health_check
+        if last_check is not None and now - last_check < self.HEALTH_CHECK_INTERVAL:
+            return
+        LLMProcessor._last_health_check = now
+        LLMProcessor._healthy = self._test_connection()
+    
+    def _test_connection(self) -> bool:
+        """
+        Test connection to Ollama service
+        
+        Returns:
+            True if the server responded
+        """
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
+            if Config.LLM_BACKEND == "llama_cpp":
+                response = self.session.get(f"{self.base_url}/health")
+                if response.status_code != 200:
+                    raise ConnectionError(f"Failed to connect to llama.cpp server: {response.status_code}")
+                logger.info("Connected to llama.cpp server successfully")
+                return True
+            response = self.session.get(f"{self.base_url}/api/tags")
             if response.status_code != 200:
                 raise ConnectionError(f"Failed to connect to Ollama: {response.status_code}")
-            print(f"Connected to Ollama successfully. Available models: {[m['name'] for m in response.json()['models']]}")
+            logger.info("Connected to Ollama successfully. Available models: %s", [m['name'] for m in response.json()['models']])
+            return True
         except Exception as e:
-            print(f"Warning: Could not connect to Ollama: {str(e)}")
-            print("Make sure Ollama is running and Llama 3.2 is installed")
+            logger.warning("Warning: Could not connect to Ollama: %s", e)
+            logger.warning("Make sure Ollama is running and Llama 3.2 is installed")
+            return False
+    
+    def _ensure_model(self):
+        """Verify a quantized model before its first call, falling back to Config.OLLAMA_MODEL if it fails"""
+        model = self.model
+        if model == Config.OLLAMA_MODEL:
+            return
+        with self._model_lock:
+            if self.model != model:
+                return
+            ok = LLMProcessor._structured_output_ok.get(model)
+            if ok is None:
+                # Low-bit quantizations can lose structured-output reliability
+                ok = LLMProcessor._structured_output_ok[model] = self._check_structured_output()
+            if not ok:
+                logger.warning("Model %s did not return valid JSON, falling back to %s", model, Config.OLLAMA_MODEL)
+                self.model = Config.OLLAMA_MODEL
+    
+    def _check_structured_output(self) -> bool:
+        """
+        Run a known speaker-naming prompt and check the JSON answer round-trips
+        
+        Returns:
+            True if the model returned the expected JSON mapping
+        """
+        prompt = _analysis_prompt(
+            "[00:00] Speaker A: Hey Jessica! How have you been?\n"
+            "[00:03] Speaker B: I'm doing great, Tom. Thanks for asking.",
+            "Return a JSON object mapping the speaker labels A and B to their names."
+        )
+        try:
+            # _generate directly: _call_ollama would re-enter _ensure_model
+            mapping = self._segment_speaker_map(self.extract_first_json_block(self._generate(
+                prompt, _ANALYSIS_SYSTEM_PROMPT, max_tokens=_MAX_TOKENS_SPEAKERS, stop=_JSON_STOP
+            )))
+        except Exception:
+            return False
+        return {"A", "B"} <= mapping.keys()
     
-    def _call_ollama(self, prompt: str, system_prompt: str = "") -> str:
+    def _call_ollama(self, prompt: str, system_prompt: str = "", stop_at_json: bool = True,
+                     max_tokens: int = 1500, temperature: float = 0.1,
+                     stop: Optional[List[str]] = None) -> str:
         """
-        Make a call to Ollama API
+        Make a streaming call to Ollama API
         
         Args:
             prompt: The user prompt
             system_prompt: The system prompt (optional)
+            stop_at_json: Stop generation as soon as the first complete JSON object
+                has been received instead of waiting for trailing text
+            max_tokens: Maximum number of tokens to generate
+            temperature: Sampling temperature
+            stop: Sequences that end generation (optional)
             
         Returns:
             Response from the LLM
         """
+        self._ensure_connection()
+        self._ensure_model()
+        return self._generate(prompt, system_prompt, stop_at_json, max_tokens, temperature, stop)
+    
+    def _generate(self, prompt: str, system_prompt: str = "", stop_at_json: bool = True,
+                  max_tokens: int = 1500, temperature: float = 0.1,
+                  stop: Optional[List[str]] = None) -> str:
+        """Send a generate request with the current model (arguments as for _call_ollama)"""
         try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.1,
+            if Config.LLM_BACKEND == "llama_cpp":
+                # llama.cpp server: no system field, and cache_prompt lets repeated
+                # calls over the same transcript skip re-processing the shared prefix
+                path = "/completion"
+                payload = {
+                    "prompt": f"{system_prompt}\n\n{prompt}" if system_prompt else prompt,
+                    "stream": True,
+                    "temperature": temperature,
                     "top_p": 0.9,
-                    "max_tokens": 4000
+                    "n_predict": max_tokens,
+                    "cache_prompt": True
                 }
-            }
-            if system_prompt:
-                payload["system"] = system_prompt
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=120
-            )
-            if response.status_code != 200:
-                raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
-            result = response.json()
-            return result.get("response", "")
+                if stop:
+                    payload["stop"] = stop
+            else:
+                path = "/api/generate"
+                payload = {
+                    "model": self.model,
+                    "prompt": prompt,
+                    "stream": True,
+                    "options": {
+                        "temperature": temperature,
+                        "top_p": 0.9,
+                        "num_predict": max_tokens
+                    }
+                }
+                if stop:
+                    payload["options"]["stop"] = stop
+                if system_prompt:
+                    payload["system"] = system_prompt
+            
+            endpoint = self._next_endpoint()
+            with self._endpoint_slots[endpoint]:
+                try:
+                    text = self._stream_generate(f"{endpoint}{path}", payload, stop_at_json)
+                except Exception:
+                    self._record_endpoint_result(endpoint, ok=False)
+                    raise
+            self._record_endpoint_result(endpoint, ok=True)
+            return text
         except Exception as e:
-            print(f"Error calling Ollama: {str(e)}")
+            logger.error("Error calling Ollama: %s", e)
             raise
     
+    def _stream_generate(self, url: str, payload: Dict[str, Any], stop_at_json: bool) -> str:
+        """
+        Stream a completion request from one LLM server endpoint
+        
+        Args:
+            url: Full URL of the generate endpoint (Ollama or llama.cpp server)
+            payload: Request body
+            stop_at_json: Return as soon as the first complete JSON object has been received
+            
+        Returns:
+            Generated text
+        """
+        parts = []
+        text = ""
+        scanner = None
+        object_start = 0
+        # Closing the response drops the connection, which makes the server abort generation
+        with self.session.post(
+            url,
+            json=payload,
+            timeout=120,
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                raise Exception(f"LLM API error: {response.status_code} - {response.text}")
+            for line in response.iter_lines():
+                # Ollama streams JSON lines, llama.cpp streams server-sent events
+                if line.startswith(b"data: "):
+                    line = line[6:]
+                if not line:
+                    continue
+                chunk = _json_loads(line)
+                if chunk.get("error"):
+                    raise Exception(f"LLM API error: {chunk['error']}")
+                parts.append(chunk.get("response") or chunk.get("content") or "")
+                if chunk.get("done") or chunk.get("stop") or not stop_at_json:
+                    continue
+                
+                # Scan only the newly received text for the end of the first JSON object
+                scan_from = len(text)
+                text += parts[-1]
+                while True:
+                    if scanner is None:
+                        object_start = text.find('{', scan_from)
+                        if object_start == -1:
+                            break
+                        scanner = _JsonScanner()
+                        scan_from = object_start
+                    end = scanner.feed(text, scan_from)
+                    if end == -1:
+                        break
+                    try:
+                        _json_loads(text[object_start:end + 1])
+                        return text
+                    except _JSONDecodeError:
+                        # Stray braces before the real object; keep looking after this one
+                        # (a nested object would only be a fragment of a malformed response)
+                        scanner = None
+                        scan_from = end + 1
+        return "".join(parts)
+
+    def _next_endpoint(self) -> str:
+        """
+        Pick the next Ollama endpoint in round-robin order, skipping quarantined ones
+        
+        Returns:
+            Endpoint base URL (the one leaving quarantine soonest if all are quarantined)
+        """
+        with self._endpoint_lock:
+            now = time.monotonic()
+            count = len(self.endpoints)
+            for offset in range(count):
+                url = self.endpoints[(self._next_index + offset) % count]
+                if self._endpoint_quarantine[url] <= now:
+                    self._next_index = (self._next_index + offset + 1) % count
+                    return url
+            return min(self.endpoints, key=self._endpoint_quarantine.__getitem__)
+    
+    def _record_endpoint_result(self, endpoint: str, ok: bool):
+        """
+        Update the circuit breaker for an endpoint after a call
+        
+        Args:
+            endpoint: Endpoint base URL
+            ok: Whether the call succeeded
+        """
+        with self._endpoint_lock:
+            if ok:
+                self._endpoint_failures[endpoint] = 0
+                return
+            self._endpoint_failures[endpoint] += 1
+            if self._endpoint_failures[endpoint] >= self.CIRCUIT_FAILURE_THRESHOLD:
+                self._endpoint_failures[endpoint] = 0
+                self._endpoint_quarantine[endpoint] = time.monotonic() + self.CIRCUIT_QUARANTINE_SECONDS
+                logger.warning("Ollama endpoint %s failing, pausing it for %.0f seconds", endpoint, self.CIRCUIT_QUARANTINE_SECONDS)
+    
     def extract_first_json_block(self, text):
         start = text.find('{')
         if start == -1:
             raise ValueError("No JSON object found in response.")
-        brace_count = 0
-        for i in range(start, len(text)):
-            if text[i] == '{':
-                brace_count += 1
-            elif text[i] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    try:
-                        return json.loads(text[start:i+1])
-                    except json.JSONDecodeError:
-                        break
+        while start != -1:
+            end = _scan_json_end(text, start)
+            if end == -1:
+                break
+            try:
+                return _json_loads(text[start:end + 1])
+            except _JSONDecodeError:
+                # Stray braces in chatter before the JSON; try the next candidate after
+                # this one (never an object nested inside it, which would be a fragment)
+                start = text.find('{', end + 1)
         raise ValueError("No valid JSON object found in response.")
     
-    def generate_meeting_minutes(self, transcript: MeetingTranscript) -> MeetingMinutes:
+    def generate_meeting_minutes(self, transcript: MeetingTranscript, force_refresh: bool = False) -> MeetingMinutes:
         """
         Generate structured meeting minutes from transcript
         
         Args:
             transcript: MeetingTranscript object
+            force_refresh: Ignore cached results and call the LLM again
             
         Returns:
             MeetingMinutes object
         """
         try:
-            print("Generating meeting minutes...")
+            logger.debug("Generating meeting minutes...")
             
             # Prepare transcript text for analysis
             transcript_text = self._prepare_transcript_text(transcript)
             
-            # System prompt for meeting minutes generation
-            system_prompt = """You are an expert meeting assistant. Your task is to analyze a meeting transcript and generate comprehensive meeting minutes. 
-            
-            Focus on:
-            1. Key points discussed
-            2. Action items with assignees and due dates
-            3. Decisions made with rationale
-            4. Next steps
-            
-            Be concise but thorough. Extract specific dates, times, and commitments mentioned."""
-            
-            # User prompt
-            prompt = f"""Please analyze this meeting transcript and generate structured meeting minutes:
+            prompt = _analysis_prompt(transcript_text, f"""Generate comprehensive, structured meeting minutes for this meeting.
 
-{transcript_text}
+{_MINUTES_INSTRUCTIONS}
 
 Please provide the analysis in the following JSON format:
-{{
-    "key_points": ["point1", "point2", ...],
-    "action_items": [
-        {{
-            "description": "action item description",
-            "assignee": "person name or 'TBD'",
-            "due_date": "YYYY-MM-DD or null",
-            "priority": "low/medium/high"
-        }}
-    ],
-    "decisions": [
-        {{
-            "topic": "decision topic",
-            "decision": "what was decided",
-            "rationale": "why this decision was made"
-        }}
-    ],
-    "next_steps": ["step1", "step2", ...],
-    "summary": "brief summary of the meeting"
-}}"""
+{_MINUTES_JSON_FORMAT}""")
             
-            # Get LLM response
-            response = self._call_ollama(prompt, system_prompt)
+            # Reuse minutes previously generated for the same transcript
+            cache_key = self.cache.make_key("minutes", self.model, transcript_text)
+            parsed_data = None if force_refresh else self.cache.get(cache_key)
             
-            # Parse JSON response
-            try:
-                parsed_data = self.extract_first_json_block(response)
-            except Exception as e:
-                print(f"Error parsing LLM response: {e}")
-                print(f"Raw response: {response}")
-                parsed_data = self._fallback_parsing(response)
-            
-            # Create action items
-            action_items = []
-            for item in parsed_data.get("action_items", []):
-                due_date = None
-                if item.get("due_date"):
-                    try:
-                        due_date = datetime.strptime(item["due_date"], "%Y-%m-%d")
-                    except ValueError:
-                        pass
+            if parsed_data is None:
+                # Get LLM response
+                response = self._call_ollama(
+                    prompt, _ANALYSIS_SYSTEM_PROMPT, max_tokens=_MAX_TOKENS_MINUTES, stop=_JSON_STOP
+                )
                 
-                action_items.append(ActionItem(
-                    description=item.get("description", ""),
-                    assignee=item.get("assignee"),
-                    due_date=due_date,
-                    priority=item.get("priority", "medium")
-                ))
-            
-            # Create decisions
-            decisions = []
-            for decision in parsed_data.get("decisions", []):
-                decisions.append(Decision(
-                    topic=decision.get("topic", ""),
-                    decision=decision.get("decision", ""),
-                    rationale=decision.get("rationale")
-                ))
+                # Parse JSON response
+                try:
+                    parsed_data = self.extract_first_json_block(response)
+                    self.cache.set(cache_key, parsed_data)
+                except Exception as e:
+                    logger.error("Error parsing LLM response: %s", e)
+                    logger.debug("Raw response: %s", response)
+                    parsed_data = self._fallback_parsing(response)
             
-            # Get unique participants
-            participants = list(set([segment.speaker for segment in transcript.segments]))
-            
-            # Ensure all list fields are not None
-            key_points = parsed_data.get("key_points") or []
-            next_steps = parsed_data.get("next_steps") or []
-            action_items = action_items or []
-            decisions = decisions or []
-
-            # Create meeting minutes
-            minutes = MeetingMinutes(
-                meeting_id=transcript.meeting_id,
-                date=transcript.created_at,
-                duration=timedelta(milliseconds=transcript.duration),
-                participants=participants,
-                key_points=key_points,
-                action_items=action_items,
-                decisions=decisions,
-                next_steps=next_steps,
-                summary=parsed_data.get("summary", "")
-            )
+            minutes = self._build_minutes(transcript, parsed_data)
             
-            print("Meeting minutes generated successfully")
+            logger.info("Meeting minutes generated successfully")
             return minutes
             
         except Exception as e:
-            print(f"Error generating meeting minutes: {str(e)}")
+            logger.error("Error generating meeting minutes: %s", e)
             raise
     
+    def generate_meeting_minutes_batch(self, transcripts: List[MeetingTranscript],
+                                       marshal_k: int = 4, force_refresh: bool = False) -> List[MeetingMinutes]:
+        """
+        Generate meeting minutes for several transcripts, marshaling up to
+        marshal_k transcripts into each LLM call to amortize prompt overhead
+        
+        Best suited to short transcripts; groups whose combined response cannot
+        be parsed fall back to one generate_meeting_minutes call per transcript.
+        
+        Args:
+            transcripts: List of MeetingTranscript objects
+            marshal_k: Maximum number of transcripts per LLM call (latency grows with K)
+            force_refresh: Ignore cached results and call the LLM again
+            
+        Returns:
+            List of MeetingMinutes objects in input order
+        """
+        results: List[Optional[MeetingMinutes]] = [None] * len(transcripts)
+        
+        # Transcripts with cached minutes never enter a marshaled prompt
+        pending = []
+        for index, transcript in enumerate(transcripts):
+            transcript_text = self._prepare_transcript_text(transcript)
+            cache_key = self.cache.make_key("minutes", self.model, transcript_text)
+            parsed_data = None if force_refresh else self.cache.get(cache_key)
+            if parsed_data is not None:
+                results[index] = self._build_minutes(transcript, parsed_data)
+            else:
+                pending.append((index, transcript_text, cache_key))
+        
+        marshal_k = max(1, marshal_k)
+        for group_start in range(0, len(pending), marshal_k):
+            group = pending[group_start:group_start + marshal_k]
+            k = len(group)
+            logger.debug("Generating meeting minutes for %s transcripts in one request...", k)
+            
+            sections = "\n\n".join(
+                f"###TRANSCRIPT {i}###\n{transcript_text}"
+                for i, (_, transcript_text, _) in enumerate(group, 1)
+            )
+            system_prompt = """You are an expert meeting assistant. Your task is to analyze several independent meeting transcripts and generate comprehensive meeting minutes for each one.
+            
+            Focus on key points, action items with assignees and due dates, decisions with rationale, and next steps.
+            Never mix information between transcripts."""
+            prompt = f"""Please analyze the following {k} meeting transcripts and generate structured meeting minutes for each:
+
+{sections}
+
+Return a single JSON object of the form {{"results": [minutes_1, ..., minutes_{k}]}} with exactly {k} entries in transcript order, where each entry has the following JSON format:
+{_MINUTES_JSON_FORMAT}"""
+            
+            try:
+                parsed_results = self.extract_json_results(
+                    self._call_ollama(prompt, system_prompt, max_tokens=_MAX_TOKENS_MINUTES * k), k
+                )
+            except Exception as e:
+                logger.error("Batched minutes generation failed (%s), falling back to individual calls", e)
+                for index, _, _ in group:
+                    results[index] = self.generate_meeting_minutes(transcripts[index], force_refresh)
+                continue
+            
+            for (index, _, cache_key), parsed_data in zip(group, parsed_results):
+                self.cache.set(cache_key, parsed_data)
+                results[index] = self._build_minutes(transcripts[index], parsed_data)
+        
+        return results
+    
+    def extract_json_results(self, text: str, k: int) -> List[Dict[str, Any]]:
+        """
+        Extract the "results" array of exactly k objects from a marshaled response
+        
+        Args:
+            text: Raw LLM response
+            k: Expected number of results
+            
+        Returns:
+            List of k parsed result objects
+            
+        Raises:
+            ValueError: If the response has no valid results array of length k
+        """
+        results = self.extract_first_json_block(text).get("results")
+        if not isinstance(results, list) or len(results) != k or not all(isinstance(r, dict) for r in results):
+            raise ValueError(f"Expected a results array of {k} objects")
+        return results
+    
     def parse_datetime(self, dt_str):
+        # Fast path: slice the fixed-width "YYYY-MM-DD HH:MM[:SS]" layout directly
+        size = len(dt_str)
+        if ((size == 16 or size == 19 and dt_str[16] == ':')
+                and dt_str[4] == '-' and dt_str[7] == '-' and dt_str[10] == ' ' and dt_str[13] == ':'):
+            digits = dt_str[0:4] + dt_str[5:7] + dt_str[8:10] + dt_str[11:13] + dt_str[14:16] + dt_str[17:19]
+            if digits.isascii() and digits.isdigit():
+                try:
+                    return datetime(int(dt_str[0:4]), int(dt_str[5:7]), int(dt_str[8:10]),
+                                    int(dt_str[11:13]), int(dt_str[14:16]), int(dt_str[17:19] or 0))
+                except ValueError:
+                    pass
+        # Anything else (e.g. single-digit hours) goes through strptime
         for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S"):
             try:
                 return datetime.strptime(dt_str, fmt)
@@ -211,30 +685,78 @@ Please provide the analysis in the following JSON format:
                 continue
         raise ValueError(f"Time data '{dt_str}' does not match expected formats.")
 
-    def extract_calendar_events(self, transcript: MeetingTranscript, minutes: MeetingMinutes) -> List[CalendarEvent]:
+    def extract_calendar_events(self, transcript: MeetingTranscript, minutes: MeetingMinutes,
+                                force_refresh: bool = False) -> List[CalendarEvent]:
         """
         Extract calendar events from meeting transcript and minutes
         
         Args:
             transcript: MeetingTranscript object
             minutes: MeetingMinutes object
+            force_refresh: Ignore cached results and call the LLM again
             
         Returns:
             List of CalendarEvent objects
         """
         try:
-            print("Extracting calendar events...")
+            logger.debug("Extracting calendar events...")
             
             # Prepare transcript text for analysis
             transcript_text = self._prepare_transcript_text(transcript)
             
-            # Get today's date and time
-            now = datetime.now()
-            today_str = now.strftime("%A, %B %d, %Y")
-            time_str = now.strftime("%I:%M %p")
+            # Date rules change with the current time, so they go after the transcript
+            prompt = _analysis_prompt(transcript_text, f"""Extract any calendar events from this meeting that should be scheduled.
+
+{self._calendar_rules_prompt()}
+Please provide the events in the following JSON format:
+{_EVENTS_JSON_FORMAT}
+
+{_EVENTS_INSTRUCTIONS}""")
+            
+            # Reuse events previously extracted for the same transcript today
+            # (relative dates in the transcript resolve against the current date)
+            cache_key = self.cache.make_key(
+                "calendar_events", self.model, datetime.now().date().isoformat(), transcript_text
+            )
+            parsed_data = None if force_refresh else self.cache.get(cache_key)
+            
+            if parsed_data is None:
+                # Get LLM response
+                response = self._call_ollama(
+                    prompt, _ANALYSIS_SYSTEM_PROMPT, max_tokens=_MAX_TOKENS_EVENTS, stop=_JSON_STOP
+                )
+                
+                # Parse JSON response
+                try:
+                    parsed_data = self.extract_first_json_block(response)
+                    self.cache.set(cache_key, parsed_data)
+                except Exception as e:
+                    logger.error("Error parsing calendar events response: %s", e)
+                    logger.debug("Raw response: %s", response)
+                    return []
+            
+            events = self._build_calendar_events(parsed_data)
             
-            # System prompt for calendar event extraction with explicit rules
-            system_prompt = f"""Today is {today_str}. The current time is {time_str}.
+            logger.info("Extracted %s calendar events", len(events))
+            return events
+            
+        except Exception as e:
+            logger.error("Error extracting calendar events: %s", e)
+            return []
+    
+    def _calendar_rules_prompt(self) -> str:
+        """
+        Build the date/time interpretation rules used for calendar event extraction
+        
+        Returns:
+            Prompt text anchored to the current date and time
+        """
+        # Get today's date and time
+        now = datetime.now()
+        today_str = now.strftime("%A, %B %d, %Y")
+        time_str = now.strftime("%I:%M %p")
+        
+        return f"""Today is {today_str}. The current time is {time_str}.
 
 When extracting event dates/times from the transcript:
 - "Thursday" means the next Thursday after today.
@@ -249,89 +771,293 @@ When extracting event dates/times from the transcript:
 - If a date is ambiguous, prefer the next possible occurrence.
 - Always return the event start and end time in the format YYYY-MM-DD HH:MM (24-hour time).
 """
+    
+    def _build_minutes(self, transcript: MeetingTranscript, parsed_data: Dict[str, Any],
+                       speaker_map: Optional[Dict[str, str]] = None) -> MeetingMinutes:
+        """
+        Build a MeetingMinutes object from parsed LLM output
+        
+        Args:
+            transcript: MeetingTranscript object the minutes were generated from
+            parsed_data: Parsed minutes JSON
+            speaker_map: Optional speaker label to name mapping applied to participants
             
-            # User prompt
-            prompt = f"""Please analyze this meeting transcript and extract any calendar events that should be scheduled:
-
-{transcript_text}
-
-Please provide the events in the following JSON format:
-{{
-    "events": [
-        {{
-            "summary": "event title",
-            "description": "event description",
-            "start_time": "YYYY-MM-DD HH:MM",
-            "end_time": "YYYY-MM-DD HH:MM",
-            "attendees": ["email1@example.com", "email2@example.com"],
-            "location": "meeting location or null"
-        }}
-    ]
-}}
-
-Only include events that have specific dates and times mentioned. If no clear events are found, return an empty events array."""
+        Returns:
+            MeetingMinutes object
+        """
+        # Create action items
+        action_items = []
+        for item in parsed_data.get("action_items") or []:
+            due_date = None
+            if item.get("due_date"):
+                try:
+                    due_date = datetime.strptime(item["due_date"], "%Y-%m-%d")
+                except ValueError:
+                    pass
             
-            # Get LLM response
-            response = self._call_ollama(prompt, system_prompt)
+            action_items.append(ActionItem(
+                description=item.get("description", ""),
+                assignee=item.get("assignee"),
+                due_date=due_date,
+                priority=item.get("priority", "medium")
+            ))
+        
+        # Create decisions
+        decisions = []
+        for decision in parsed_data.get("decisions") or []:
+            decisions.append(Decision(
+                topic=decision.get("topic", ""),
+                decision=decision.get("decision", ""),
+                rationale=decision.get("rationale")
+            ))
+        
+        # Get unique participants in speaking order
+        participants = transcript.unique_speakers
+        if speaker_map:
+            participants = [speaker_map.get(speaker, speaker) for speaker in participants]
+        
+        # Ensure all list fields are not None
+        key_points = parsed_data.get("key_points") or []
+        next_steps = parsed_data.get("next_steps") or []
+
+        # Create meeting minutes
+        return MeetingMinutes(
+            meeting_id=transcript.meeting_id,
+            date=transcript.created_at,
+            duration=timedelta(milliseconds=transcript.duration),
+            participants=participants,
+            key_points=key_points,
+            action_items=action_items,
+            decisions=decisions,
+            next_steps=next_steps,
+            summary=parsed_data.get("summary") or ""
+        )
+    
+    def _build_calendar_events(self, parsed_data: Dict[str, Any]) -> List[CalendarEvent]:
+        """
+        Build CalendarEvent objects from parsed LLM output
+        
+        Args:
+            parsed_data: Parsed JSON containing an "events" list
             
-            # Parse JSON response
+        Returns:
+            List of CalendarEvent objects (invalid entries are skipped)
+        """
+        events = []
+        for event_data in parsed_data.get("events") or []:
             try:
-                parsed_data = self.extract_first_json_block(response)
-            except Exception as e:
-                print(f"Error parsing calendar events response: {e}")
-                print(f"Raw response: {response}")
-                return []
+                start_time = self.parse_datetime(event_data["start_time"])
+                end_time = self.parse_datetime(event_data["end_time"])
+                
+                events.append(CalendarEvent(
+                    summary=event_data.get("summary", ""),
+                    description=event_data.get("description", ""),
+                    start_time=start_time,
+                    end_time=end_time,
+                    attendees=event_data.get("attendees") or [],
+                    location=event_data.get("location")
+                ))
+            except (ValueError, KeyError, TypeError) as e:
+                logger.error("Error parsing event data: %s", e)
+                continue
+        return events
+    
+    def _validate_speaker_map(self, mapping: Any) -> Dict[str, str]:
+        """
+        Keep only string-to-string entries of an LLM speaker mapping
+        
+        Args:
+            mapping: Parsed JSON mapping
             
-            # Create calendar events
-            events = []
-            for event_data in parsed_data.get("events", []):
-                try:
-                    start_time = self.parse_datetime(event_data["start_time"])
-                    end_time = self.parse_datetime(event_data["end_time"])
-                    
-                    events.append(CalendarEvent(
-                        summary=event_data.get("summary", ""),
-                        description=event_data.get("description", ""),
-                        start_time=start_time,
-                        end_time=end_time,
-                        attendees=event_data.get("attendees", []),
-                        location=event_data.get("location")
-                    ))
-                except (ValueError, KeyError) as e:
-                    print(f"Error parsing event data: {e}")
-                    continue
+        Returns:
+            Validated mapping of speaker labels to names
+        """
+        if not isinstance(mapping, dict):
+            raise ValueError("Response is not a valid dictionary")
+        return {
+            speaker_label: inferred_name
+            for speaker_label, inferred_name in mapping.items()
+            if isinstance(speaker_label, str) and isinstance(inferred_name, str)
+        }
+    
+    def _segment_speaker_map(self, mapping: Any) -> Dict[str, str]:
+        """
+        Validate an LLM speaker mapping and key it by segment speaker label
+        
+        Prompt transcripts label lines "Speaker A", but segments are labeled "A".
+        
+        Args:
+            mapping: Parsed JSON mapping
             
-            print(f"Extracted {len(events)} calendar events")
-            return events
+        Returns:
+            Mapping of segment speaker labels to names
+        """
+        return {
+            speaker_label[len("Speaker "):] if speaker_label.startswith("Speaker ") else speaker_label: inferred_name
+            for speaker_label, inferred_name in self._validate_speaker_map(mapping).items()
+        }
+    
+    def process_transcript_batch(self, transcript: MeetingTranscript, force_refresh: bool = False) -> Tuple[Dict[str, str], MeetingMinutes, List[CalendarEvent]]:
+        """
+        Infer speaker names, generate meeting minutes and extract calendar events
+        with a single LLM call, so the transcript is only sent and processed once
+        
+        Args:
+            transcript: MeetingTranscript object
+            force_refresh: Ignore cached results and call the LLM again
             
-        except Exception as e:
-            print(f"Error extracting calendar events: {str(e)}")
-            return []
+        Returns:
+            Tuple of (speaker label to name mapping, MeetingMinutes, list of CalendarEvent)
+            
+        Raises:
+            ValueError: If the combined response cannot be parsed
+        """
+        logger.debug("Analyzing transcript (speaker names, minutes and calendar events)...")
+        
+        transcript_text = self._prepare_transcript_text(transcript)
+        
+        prompt = _analysis_prompt(transcript_text, f"""Complete all of the following tasks for this meeting in one pass.
+
+TASK 1 - SPEAKERS
+{_SPEAKER_INSTRUCTIONS}
+
+TASK 2 - MINUTES
+Generate comprehensive meeting minutes, referring to speakers by their inferred names.
+{_MINUTES_INSTRUCTIONS}
+
+TASK 3 - CALENDAR
+Extract calendar events that should be scheduled.
+{self._calendar_rules_prompt()}
+Please provide the analysis as a single JSON object in the following format:
+{_COMBINED_JSON_FORMAT}
+
+{_EVENTS_INSTRUCTIONS}""")
+        
+        # Reuse an analysis previously produced for the same transcript today
+        cache_key = self.cache.make_key(
+            "transcript_batch", self.model, datetime.now().date().isoformat(), transcript_text
+        )
+        cached_data = None if force_refresh else self.cache.get(cache_key)
+        if cached_data is None:
+            response = self._call_ollama(
+                prompt, _ANALYSIS_SYSTEM_PROMPT, max_tokens=_MAX_TOKENS_COMBINED, stop=_JSON_STOP
+            )
+            parsed_data = self.extract_first_json_block(response)
+        else:
+            parsed_data = cached_data
+        
+        minutes_data = parsed_data.get("minutes")
+        if not isinstance(minutes_data, dict):
+            raise ValueError("Combined response is missing the minutes object")
+        
+        speaker_map = self._segment_speaker_map(parsed_data.get("speaker_names") or {})
+        minutes = self._build_minutes(transcript, minutes_data, speaker_map)
+        events = self._build_calendar_events(parsed_data)
+        if cached_data is None:
+            self.cache.set(cache_key, parsed_data)
+        
+        logger.info("Transcript analyzed: %s speaker names, %s calendar events", len(speaker_map), len(events))
+        return speaker_map, minutes, events
+    
+    def process_many(self, transcripts: List[MeetingTranscript],
+                     max_concurrency: Optional[int] = None) -> List[Tuple[Dict[str, str], MeetingMinutes, List[CalendarEvent]]]:
+        """
+        Analyze several transcripts concurrently with process_transcript_batch
+        
+        Each Ollama endpoint serves up to OLLAMA_NUM_PARALLEL requests per model at
+        once, so independent transcripts overlap instead of queueing behind each other.
+        
+        Args:
+            transcripts: List of MeetingTranscript objects
+            max_concurrency: Maximum number of requests in flight (defaults to
+                Config.OLLAMA_NUM_PARALLEL per endpoint)
+            
+        Returns:
+            List of (speaker map, MeetingMinutes, calendar events) tuples in input order
+            
+        Raises:
+            ValueError: If a combined response cannot be parsed
+        """
+        workers = max(1, max_concurrency or Config.OLLAMA_NUM_PARALLEL * len(self.endpoints))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self.process_transcript_batch, transcripts))
     
     def _prepare_transcript_text(self, transcript: MeetingTranscript) -> str:
         """
         Prepare transcript text for LLM analysis
         
+        The text is cached on the transcript until its speakers are relabeled.
+        
         Args:
             transcript: MeetingTranscript object
             
         Returns:
             Formatted transcript text
         """
-        text_parts = []
+        if transcript._prompt_text is None:
+            speakers_info = ", ".join(f"Speaker {s.speaker_id}" for s in transcript.speakers)
+            segment_lines = "\n".join(self._compress_transcript(transcript))
+            transcript._prompt_text = f"Meeting Participants: {speakers_info}\n\n{segment_lines}"
+        return transcript._prompt_text
+    
+    def _compress_transcript(self, transcript: MeetingTranscript,
+                             max_tokens: Optional[int] = None) -> List[str]:
+        """
+        Format transcript segments as prompt lines within a token budget
         
-        # Add speaker information
-        speakers_info = ", ".join([f"Speaker {s.speaker_id}" for s in transcript.speakers])
-        text_parts.append(f"Meeting Participants: {speakers_info}")
-        text_parts.append("")
+        Without a budget every segment is sent as is. With one, disfluencies
+        (um, uh, hmm) are dropped and consecutive segments from the same speaker
+        are merged; if the result is still over budget, the start and end of
+        the meeting are kept and the middle is elided.
+        
+        Args:
+            transcript: MeetingTranscript object
+            max_tokens: Token budget for the lines (defaults to Config.LLM_MAX_TRANSCRIPT_TOKENS, 0 sends everything)
+            
+        Returns:
+            List of "[MM:SS] Speaker X: text" lines
+        """
+        if max_tokens is None:
+            max_tokens = Config.LLM_MAX_TRANSCRIPT_TOKENS
+        if max_tokens <= 0:
+            return [
+                f"[{format_timestamp(segment.start)}] Speaker {segment.speaker}: {segment.text}"
+                for segment in transcript.segments
+            ]
         
-        # Add transcript segments
+        # Merge runs of the same speaker, skipping filler
+        turns = []  # [start_ms, speaker, [texts]]
         for segment in transcript.segments:
-            start = int(segment.start)
-            timestamp = f"[{start//1000//60:02d}:{start//1000%60:02d}]"
-            text_parts.append(f"{timestamp} Speaker {segment.speaker}: {segment.text}")
+            text = segment.text.strip()
+            if not text or text.lower().strip(_FILLER_PUNCTUATION) in _FILLER_UTTERANCES:
+                continue
+            if turns and turns[-1][1] == segment.speaker:
+                turns[-1][2].append(text)
+            else:
+                turns.append([segment.start, segment.speaker, [text]])
+        
+        lines = [
+            f"[{format_timestamp(start)}] Speaker {speaker}: {' '.join(texts)}"
+            for start, speaker, texts in turns
+        ]
+        costs = [_estimate_tokens(line) + 1 for line in lines]
+        if sum(costs) <= max_tokens:
+            return lines
+        
+        # Keep the opening and closing 40% of the budget each
+        window = int(max_tokens * 0.4)
+        head, used = 0, 0
+        while head < len(lines) and used + costs[head] <= window:
+            used += costs[head]
+            head += 1
+        tail, used = len(lines), 0
+        while tail > head and used + costs[tail - 1] <= window:
+            tail -= 1
+            used += costs[tail]
         
-        return "\n".join(text_parts)
+        omitted = tail - head
+        logger.warning("Transcript over %s tokens, omitting %s segments from the middle", max_tokens, omitted)
+        return lines[:head] + [f"... [{omitted} segments omitted] ..."] + lines[tail:]
     
     def _fallback_parsing(self, response: str) -> Dict[str, Any]:
         """
@@ -343,7 +1069,7 @@ Only include events that have specific dates and times mentioned. If no clear ev
         Returns:
             Parsed data dictionary
         """
-        print("Using fallback parsing for LLM response")
+        logger.debug("Using fallback parsing for LLM response")
         
         # Simple extraction of key information
         key_points = []
@@ -355,14 +1081,13 @@ Only include events that have specific dates and times mentioned. If no clear ev
         # Extract key points (lines starting with - or •)
         for line in response.split('\n'):
             line = line.strip()
-            if line.startswith(('-', '•', '*')) and len(line) > 2:
+            if line[:1] in _BULLET_FIRSTCHARS and len(line) > 2:
                 key_points.append(line[1:].strip())
         
         # Extract summary (look for summary section)
-        if "summary" in response.lower():
-            summary_match = re.search(r'summary[:\s]+(.+?)(?:\n|$)', response, re.IGNORECASE)
-            if summary_match:
-                summary = summary_match.group(1).strip()
+        summary_match = _SUMMARY_RE.search(response)
+        if summary_match:
+            summary = summary_match.group(1).strip()
         
         return {
             "key_points": key_points,
@@ -372,33 +1097,16 @@ Only include events that have specific dates and times mentioned. If no clear ev
             "summary": summary
         }
 
-    def infer_speaker_names(self, transcript):
+    def infer_speaker_names(self, transcript, force_refresh: bool = False):
         """
         Use the LLM to infer real names for speaker labels based on transcript context.
         Returns a dict mapping speaker labels to names.
         """
-        # Prepare transcript text for analysis
-        transcript_lines = []
-        for segment in transcript.segments:
-            start = int(segment.start)
-            timestamp = f"[{start//1000//60:02d}:{start//1000%60:02d}]"
-            transcript_lines.append(f"{timestamp} {segment.speaker}: {segment.text}")
-        transcript_text = "\n".join(transcript_lines)
-        system_prompt = (
-            "You are an expert meeting assistant specializing in speaker identification. "
-            "Given a meeting transcript with speaker labels and their utterances, "
-            "infer the most likely real names for each speaker label by analyzing the context of greetings, references, and replies. "
-            "Do NOT assign a name to a speaker just because their name is mentioned in a greeting. "
-            "Instead, deduce the mapping by observing how speakers address each other and how names are reciprocated in conversation. "
-            "For example, if Speaker A says 'Hey Jessica!' and Speaker B replies 'I'm doing great, Tom', then Speaker A is Tom and Speaker B is Jessica. "
-            "If a name cannot be determined with reasonable confidence, keep the original label. "
-            "Output only a JSON mapping of speaker labels to names."
-        )
-        
-        prompt = f"""
-Please analyze this meeting transcript and infer the real names for each speaker:
+        # Same cached text as the minutes and events prompts, so the prompt prefix is shared too
+        transcript_text = self._prepare_transcript_text(transcript)
+        prompt = _analysis_prompt(transcript_text, f"""Infer the real names for each speaker label in this meeting.
 
-{transcript_text}
+{_SPEAKER_INSTRUCTIONS}
 
 Use the following logic:
 - If Speaker A greets 'Jessica' and Speaker B replies to 'Tom', infer Speaker A is Tom and Speaker B is Jessica.
@@ -429,80 +1137,62 @@ Mapping:
   "C": "Ravi"
 }}
 
-Now, provide a JSON mapping of speaker labels to inferred names for the transcript above. If you cannot confidently infer a name, keep the original label.
-"""
+Now, provide a JSON mapping of speaker labels to inferred names for the transcript above. If you cannot confidently infer a name, keep the original label.""")
         try:
-            response = self._call_ollama(prompt, system_prompt)
-            try:
-                mapping = self.extract_first_json_block(response)
-            except Exception as parse_exc:
-                import traceback; traceback.print_exc()
-                raise
-            if not isinstance(mapping, dict):
-                raise ValueError("Response is not a valid dictionary")
-            # Validate the mapping
-            validated_mapping = {}
-            for speaker_label, inferred_name in mapping.items():
-                if isinstance(speaker_label, str) and isinstance(inferred_name, str):
-                    validated_mapping[speaker_label] = inferred_name
-            return validated_mapping
+            # Only an identical transcript reuses a previous mapping
+            cache_key = self.cache.make_key("speaker_names", self.model, transcript_text)
+            
+            def _infer():
+                return self._segment_speaker_map(
+                    self.extract_first_json_block(self._call_ollama(
+                        prompt, _ANALYSIS_SYSTEM_PROMPT, max_tokens=_MAX_TOKENS_SPEAKERS, stop=_JSON_STOP
+                    ))
+                )
+            
+            return self.cache.get_or_compute(cache_key, _infer, force_refresh)
         except Exception as e:
-            print(f"Error inferring speaker names: {e}")
-            print(f"Raw response: {locals().get('response', None)}")
-            import traceback; traceback.print_exc()
+            logger.error("Error inferring speaker names: %s", e)
+            logger.debug("Speaker name inference failed", exc_info=True)
             return {}
 
-    def analyze_speaker_names_from_text(self, transcript_text: str) -> dict:
+    def analyze_speaker_names_from_text(self, transcript_text: str, force_refresh: bool = False) -> dict:
         """
         Analyze transcript text to infer speaker names
         
         Args:
             transcript_text: Raw transcript text content
+            force_refresh: Ignore cached results and call the LLM again
             
         Returns:
             Dictionary mapping speaker labels to inferred names
         """
-        system_prompt = (
-            "You are an expert meeting assistant specializing in speaker identification. "
-            "Given a meeting transcript, analyze the content to infer the most likely real names "
-            "for each speaker label based on context clues, introductions, self-identifications, "
-            "or references by other speakers. "
-            "Look for patterns like: 'Hi, I'm John', 'This is Sarah speaking', 'John mentioned...', etc. "
-            "If a name cannot be determined with reasonable confidence, keep the original label. "
-            "Output only a JSON mapping of speaker labels to names."
-        )
-        
-        prompt = f"""
-Please analyze this meeting transcript and infer the real names for each speaker:
+        prompt = _analysis_prompt(transcript_text, """Infer the real names for each speaker label in this meeting.
 
-{transcript_text}
+Analyze the content for context clues, introductions, self-identifications, or references by other speakers.
+Look for patterns like: 'Hi, I'm John', 'This is Sarah speaking', 'John mentioned...', etc.
+If a name cannot be determined with reasonable confidence, keep the original label.
 
 Provide a JSON mapping of speaker labels to inferred names. For example:
-{{
+{
   "Speaker A": "John Smith",
   "Speaker B": "Sarah Johnson",
   "Speaker C": "Speaker C"
-}}
+}
 
-Only change labels where you can confidently infer a name from the context.
-"""
+Only change labels where you can confidently infer a name from the context.""")
         
         try:
-            response = self._call_ollama(prompt, system_prompt)
-            mapping = self.extract_first_json_block(response)
+            cache_key = self.cache.make_key("speaker_names_text", self.model, transcript_text)
             
-            if not isinstance(mapping, dict):
-                raise ValueError("Response is not a valid dictionary")
-            
-            # Validate the mapping
-            validated_mapping = {}
-            for speaker_label, inferred_name in mapping.items():
-                if isinstance(speaker_label, str) and isinstance(inferred_name, str):
-                    validated_mapping[speaker_label] = inferred_name
+            def _infer():
+                return self._validate_speaker_map(
+                    self.extract_first_json_block(self._call_ollama(
+                        prompt, _ANALYSIS_SYSTEM_PROMPT, max_tokens=_MAX_TOKENS_SPEAKERS, stop=_JSON_STOP
+                    ))
+                )
             
-            return validated_mapping
+            return self.cache.get_or_compute(cache_key, _infer, force_refresh)
             
         except Exception as e:
-            print(f"Error analyzing speaker names from text: {e}")
-            print(f"Raw response: {response}")
+            logger.error("Error analyzing speaker names from text: %s", e)
             return {} 
@@ -0,0 +1,46 @@
+"""
+Data models for transcripts, minutes, calendar events and processing results
+
+Submodules are imported on first attribute access (PEP 562), so commands that
+only need a transcript do not pay for defining every pydantic model.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .transcript import (
+        SpeakerRole, Speaker, TranscriptionSegment, MeetingTranscript, format_timestamp
+    )
+    from .minutes import ActionItem, Decision, MeetingMinutes
+    from .calendar import CalendarEvent
+    from .result import ProcessingStatus, ProcessingResult
+
+# Public name -> submodule defining it
+_LAZY = {
+    "SpeakerRole": ".transcript",
+    "Speaker": ".transcript",
+    "TranscriptionSegment": ".transcript",
+    "MeetingTranscript": ".transcript",
+    "format_timestamp": ".transcript",
+    "ActionItem": ".minutes",
+    "Decision": ".minutes",
+    "MeetingMinutes": ".minutes",
+    "CalendarEvent": ".calendar",
+    "ProcessingStatus": ".result",
+    "ProcessingResult": ".result",
+}
+
+__all__ = list(_LAZY)
+
+def __getattr__(name):
+    submodule = _LAZY.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(submodule, __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+
+class CalendarEvent(BaseModel):
+    """Model for Google Calendar event creation"""
+    summary: str
+    description: str
+    start_time: datetime
+    end_time: datetime
+    attendees: List[str] = []
+    location: Optional[str] = None
+    reminders: Dict[str, Any] = {
+        "useDefault": False,
+        "overrides": [
+            {"method": "email", "minutes": 24 * 60},
+            {"method": "popup", "minutes": 30},
+        ]
+    }
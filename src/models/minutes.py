@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime, timedelta
+
+class ActionItem(BaseModel):
+    """Model for action items from the meeting"""
+    description: str
+    assignee: Optional[str] = None
+    due_date: Optional[datetime] = None
+    priority: str = "medium"  # low, medium, high
+    status: str = "pending"   # pending, in_progress, completed
+
+class Decision(BaseModel):
+    """Model for decisions made in the meeting"""
+    topic: str
+    decision: str
+    rationale: Optional[str] = None
+    impact: Optional[str] = None
+
+class MeetingMinutes(BaseModel):
+    """Model for structured meeting minutes"""
+    meeting_id: str
+    date: datetime
+    duration: timedelta
+    participants: List[str]
+    key_points: List[str]
+    action_items: List[ActionItem]
+    decisions: List[Decision]
+    next_steps: List[str]
+    summary: str
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from enum import Enum
+
+from .transcript import MeetingTranscript
+from .minutes import MeetingMinutes
+from .calendar import CalendarEvent
+
+class ProcessingStatus(str, Enum):
+    """Enum for processing status"""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ProcessingResult(BaseModel):
+    """Model for processing results"""
+    status: ProcessingStatus
+    meeting_id: str
+    transcript: Optional[MeetingTranscript] = None
+    minutes: Optional[MeetingMinutes] = None
+    calendar_events: List[CalendarEvent] = []
+    error_message: Optional[str] = None
+    processing_time: Optional[float] = None  # in seconds
@@ -0,0 +1,93 @@
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import List, Optional, Dict
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+
+class SpeakerRole(str, Enum):
+    """Enum for speaker roles in the meeting"""
+    PARTICIPANT = "participant"
+    MODERATOR = "moderator"
+    UNKNOWN = "unknown"
+
+# Speakers and segments are built by the hundreds from already-validated AssemblyAI
+# output, so they are plain slotted dataclasses (Python 3.10+) instead of pydantic models
+
+def _check_confidence(confidence: float):
+    """Reject confidence scores outside 0.0 to 1.0, as the pydantic models did"""
+    if not 0.0 <= confidence <= 1.0:
+        raise ValueError(f"confidence must be between 0.0 and 1.0, got {confidence}")
+
+@dataclass(slots=True, kw_only=True)
+class Speaker:
+    """Model for speaker information"""
+    speaker_id: str
+    role: SpeakerRole = SpeakerRole.PARTICIPANT
+    name: Optional[str] = None
+    confidence: float  # 0.0 to 1.0
+    
+    def __post_init__(self):
+        _check_confidence(self.confidence)
+
+def format_timestamp(milliseconds: int) -> str:
+    """Format a millisecond offset as MM:SS"""
+    return _format_seconds(int(milliseconds) // 1000)
+
+@lru_cache(maxsize=8192)
+def _format_seconds(total_seconds: int) -> str:
+    """Format a whole-second offset as MM:SS (memoized; segments often share offsets)"""
+    minutes, seconds = divmod(total_seconds, 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+@dataclass(slots=True, kw_only=True)
+class TranscriptionSegment:
+    """Model for a segment of transcribed speech"""
+    start: int  # Start time in milliseconds
+    end: int    # End time in milliseconds
+    speaker: str
+    text: str
+    confidence: float  # 0.0 to 1.0
+    
+    def __post_init__(self):
+        _check_confidence(self.confidence)
+
+class MeetingTranscript(BaseModel):
+    """Model for the complete meeting transcript"""
+    meeting_id: str
+    audio_url: str
+    duration: int  # Duration in milliseconds
+    speakers: List[Speaker]
+    segments: List[TranscriptionSegment]
+    created_at: datetime = Field(default_factory=datetime.now)
+    
+    # Transcript text formatted for LLM prompts, built once and reused by every analysis call
+    _prompt_text: Optional[str] = PrivateAttr(default=None)
+    
+    @property
+    def unique_speakers(self) -> List[str]:
+        """Speaker labels in order of first appearance in the segments"""
+        return list({segment.speaker: None for segment in self.segments})
+    
+    def speaker_talk_time(self) -> Dict[str, int]:
+        """Total speaking time in milliseconds per speaker label, in order of first appearance"""
+        talk_time: Dict[str, int] = {}
+        get = talk_time.get
+        for segment in self.segments:
+            talk_time[segment.speaker] = get(segment.speaker, 0) + segment.end - segment.start
+        return talk_time
+    
+    def relabel_speakers(self, speaker_map: Dict[str, str]):
+        """
+        Rename speaker labels in segments and participants
+        
+        Args:
+            speaker_map: Dictionary mapping speaker labels to new names (unmapped labels are kept)
+        """
+        # Single dict lookup per item; unmapped labels fall back to themselves
+        rename = speaker_map.get
+        for segment in self.segments:
+            segment.speaker = rename(segment.speaker, segment.speaker)
+        for speaker in self.speakers:
+            speaker.speaker_id = rename(speaker.speaker_id, speaker.speaker_id)
+        self._prompt_text = None
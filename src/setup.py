@@ -28,8 +28,8 @@ def check_python_version():
     """Check if Python version is compatible"""
     print("🐍 Checking Python version...")
     version = sys.version_info
-    if version.major < 3 or (version.major == 3 and version.minor < 8):
-        print(f"❌ Python 3.8+ required, found {version.major}.{version.minor}")
+    if version.major < 3 or (version.major == 3 and version.minor < 10):
+        print(f"❌ Python 3.10+ required, found {version.major}.{version.minor}")
         return False
     print(f"✅ Python {version.major}.{version.minor}.{version.micro} is compatible")
     return True
@@ -162,7 +162,7 @@ def create_directories():
     """Create necessary directories"""
     print("📁 Creating directories...")
     
-    directories = ["output", "output/minutes", "output/transcripts", "config", "examples", "tests", "docs"]
+    directories = ["output", "output/minutes", "output/transcripts", "output/cache", "config", "examples", "tests", "docs"]
     for directory in directories:
         os.makedirs(directory, exist_ok=True)
         print(f"✅ Created directory: {directory}")
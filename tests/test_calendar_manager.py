@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for calendar availability checks
+
+Runs against a canned FreeBusy response, so no Google credentials are needed.
+"""
+
+import unittest
+from datetime import datetime, timezone
+
+from calendar_manager import CalendarManager
+
+class _FakeRequest:
+    """Stands in for a googleapiclient request and returns a fixed response"""
+
+    def __init__(self, response):
+        self.response = response
+
+    def execute(self, num_retries=0):
+        return self.response
+
+class _FakeFreeBusy:
+    def __init__(self, response):
+        self.response = response
+
+    def query(self, body, fields=None):
+        return _FakeRequest(self.response)
+
+class _FakeService:
+    def __init__(self, response):
+        self.response = response
+
+    def freebusy(self):
+        return _FakeFreeBusy(self.response)
+
+def _manager_with_busy(busy):
+    """Build a CalendarManager whose FreeBusy query returns the given busy intervals"""
+    manager = CalendarManager.__new__(CalendarManager)
+    manager.service = _FakeService({'calendars': {'primary': {'busy': busy}}})
+    return manager
+
+class CheckAvailabilityBulkTest(unittest.TestCase):
+    """check_availability_bulk with Z-suffixed timestamps as Google returns them"""
+
+    def test_z_suffixed_busy_intervals(self):
+        manager = _manager_with_busy([
+            {'start': '2025-01-02T10:00:00Z', 'end': '2025-01-02T11:00:00Z'},
+            {'start': '2025-01-02T10:30:00.000Z', 'end': '2025-01-02T12:00:00Z'},
+        ])
+        utc = timezone.utc
+        slots = [
+            (datetime(2025, 1, 2, 9, 0, tzinfo=utc), datetime(2025, 1, 2, 10, 0, tzinfo=utc)),
+            (datetime(2025, 1, 2, 11, 30, tzinfo=utc), datetime(2025, 1, 2, 12, 30, tzinfo=utc)),
+            (datetime(2025, 1, 2, 12, 0, tzinfo=utc), datetime(2025, 1, 2, 13, 0, tzinfo=utc)),
+        ]
+        self.assertEqual(manager.check_availability_bulk(slots), [True, False, True])
+
+    def test_malformed_timestamp_is_not_reported_as_busy(self):
+        manager = _manager_with_busy([{'start': 'not a time', 'end': '2025-01-02T11:00:00Z'}])
+        slot = (datetime(2025, 1, 2, 9, 0), datetime(2025, 1, 2, 10, 0))
+        with self.assertRaises(ValueError):
+            manager.check_availability_bulk([slot])
+
+if __name__ == "__main__":
+    unittest.main()